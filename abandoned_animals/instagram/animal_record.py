@@ -0,0 +1,242 @@
+"""
+유기/실종동물 레코드 모델
+API 응답(dict)을 한 곳에서 파싱해 날짜/성별/축종이 정리된 가벼운 객체로 변환
+"""
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Optional
+
+
+class Sex(Enum):
+    MALE = 'M'
+    FEMALE = 'F'
+    UNKNOWN = 'Q'
+
+    @property
+    def label(self) -> str:
+        return {'M': '수컷', 'F': '암컷', 'Q': '미상'}[self.value]
+
+    @classmethod
+    def parse(cls, code: Optional[str]) -> 'Sex':
+        try:
+            return cls(code)
+        except ValueError:
+            return cls.UNKNOWN
+
+
+class Species(Enum):
+    DOG = '417000'
+    CAT = '422400'
+    OTHER = '429900'
+
+    @property
+    def label(self) -> str:
+        return {'417000': '개', '422400': '고양이', '429900': '기타'}[self.value]
+
+    @classmethod
+    def parse(cls, code: Optional[str], name: Optional[str] = None) -> 'Species':
+        """축종 코드(upKindCd) 우선, 없으면 축종명(upKindNm)으로 판단"""
+        try:
+            return cls(code)
+        except ValueError:
+            pass
+        for species in cls:
+            if name == species.label:
+                return species
+        return cls.OTHER
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """'20260113', '2026-01-13', '2026-01-13 10:00:00' 형식을 date로 변환"""
+    if not value:
+        return None
+    digits = value[:10].replace('-', '')
+    if len(digits) != 8 or not digits.isdigit():
+        return None
+    try:
+        return datetime.strptime(digits, '%Y%m%d').date()
+    except ValueError:
+        return None
+
+
+def lost_animal_id(animal: Dict) -> str:
+    """실종동물 고유 ID (popfile URL 기반, 없으면 여러 필드 조합)"""
+    popfile = animal.get('popfile', '')
+    if popfile and '/files/' in popfile:
+        return popfile.split('/files/')[-1]
+    return f"{animal.get('happenDt', '')}_{animal.get('kindCd', '')}_{animal.get('happenAddr', '')}"
+
+
+def _format_date(value: Optional[date], sep: str = '') -> str:
+    return value.strftime(f'%Y{sep}%m{sep}%d') if value else ''
+
+
+def _text(item: Dict, key: str) -> str:
+    value = item.get(key)
+    return str(value) if value is not None else ''
+
+
+def _interned(item: Dict, key: str) -> str:
+    """반복이 많은 값(지역/보호소/품종명)은 intern해서 메모리 공유"""
+    return sys.intern(_text(item, key))
+
+
+@dataclass(slots=True)
+class AbandonedAnimal:
+    """구조동물 (abandonmentPublic_v2)"""
+    desertion_no: str
+    notice_no: str
+    notice_sdt: Optional[date]
+    notice_edt: Optional[date]
+    happen_dt: Optional[date]
+    happen_place: str
+    species: Species
+    kind_nm: str
+    color: str
+    age: str
+    weight: str
+    sex: Sex
+    neuter_yn: str
+    special_mark: str
+    care_nm: str
+    care_tel: str
+    care_addr: str
+    org_nm: str
+    process_state: str
+    popfile1: str
+    popfile2: str
+    upd_tm: str
+
+    @property
+    def animal_id(self) -> str:
+        return self.desertion_no
+
+    @property
+    def image_url(self) -> str:
+        return self.popfile1
+
+    def to_dict(self) -> Dict:
+        """API 응답과 같은 키를 가진 dict로 변환"""
+        return {
+            'desertionNo': self.desertion_no,
+            'noticeNo': self.notice_no,
+            'noticeSdt': _format_date(self.notice_sdt),
+            'noticeEdt': _format_date(self.notice_edt),
+            'happenDt': _format_date(self.happen_dt),
+            'happenPlace': self.happen_place,
+            'upKindCd': self.species.value,
+            'upKindNm': self.species.label,
+            'kindNm': self.kind_nm,
+            'colorCd': self.color,
+            'age': self.age,
+            'weight': self.weight,
+            'sexCd': self.sex.value,
+            'neuterYn': self.neuter_yn,
+            'specialMark': self.special_mark,
+            'careNm': self.care_nm,
+            'careTel': self.care_tel,
+            'careAddr': self.care_addr,
+            'orgNm': self.org_nm,
+            'processState': self.process_state,
+            'popfile1': self.popfile1,
+            'popfile2': self.popfile2,
+            'updTm': self.upd_tm,
+        }
+
+
+@dataclass(slots=True)
+class LostAnimal:
+    """실종동물 (lossInfo)"""
+    animal_id: str
+    happen_dt: Optional[date]
+    happen_place: str
+    happen_addr: str
+    species: Species
+    kind_nm: str
+    color: str
+    age: str
+    sex: Sex
+    special_mark: str
+    org_nm: str
+    popfile: str
+    call_name: str
+    call_tel: str
+
+    @property
+    def image_url(self) -> str:
+        return self.popfile
+
+    @property
+    def loss_place(self) -> str:
+        return self.happen_place
+
+    def to_dict(self) -> Dict:
+        """API 응답과 같은 키를 가진 dict로 변환"""
+        return {
+            'happenDt': _format_date(self.happen_dt, '-'),
+            'happenPlace': self.happen_place,
+            'happenAddr': self.happen_addr,
+            'upKindCd': self.species.value,
+            'upKindNm': self.species.label,
+            'kindCd': self.kind_nm,
+            'colorCd': self.color,
+            'age': self.age,
+            'sexCd': self.sex.value,
+            'specialMark': self.special_mark,
+            'orgNm': self.org_nm,
+            'popfile': self.popfile,
+            'callName': self.call_name,
+            'callTel': self.call_tel,
+        }
+
+
+def parse_abandoned(item: Dict) -> AbandonedAnimal:
+    """abandonmentPublic_v2 응답 항목 → AbandonedAnimal"""
+    return AbandonedAnimal(
+        desertion_no=_text(item, 'desertionNo'),
+        notice_no=_text(item, 'noticeNo'),
+        notice_sdt=parse_date(item.get('noticeSdt')),
+        notice_edt=parse_date(item.get('noticeEdt')),
+        happen_dt=parse_date(item.get('happenDt')),
+        happen_place=_text(item, 'happenPlace'),
+        species=Species.parse(item.get('upKindCd'), item.get('upKindNm')),
+        kind_nm=_interned(item, 'kindNm'),
+        color=_interned(item, 'colorCd'),
+        age=_text(item, 'age'),
+        weight=_text(item, 'weight'),
+        sex=Sex.parse(item.get('sexCd')),
+        neuter_yn=_text(item, 'neuterYn'),
+        special_mark=_text(item, 'specialMark'),
+        care_nm=_interned(item, 'careNm'),
+        care_tel=_interned(item, 'careTel'),
+        care_addr=_interned(item, 'careAddr'),
+        org_nm=_interned(item, 'orgNm'),
+        process_state=_interned(item, 'processState'),
+        popfile1=_text(item, 'popfile1'),
+        popfile2=_text(item, 'popfile2'),
+        upd_tm=_text(item, 'updTm'),
+    )
+
+
+def parse_lost(item: Dict) -> LostAnimal:
+    """lossInfo 응답 항목 → LostAnimal (kindCd는 품종명, happenPlace는 실종지역)"""
+    return LostAnimal(
+        animal_id=lost_animal_id(item),
+        happen_dt=parse_date(item.get('happenDt')),
+        happen_place=_text(item, 'happenPlace'),
+        happen_addr=_text(item, 'happenAddr'),
+        species=Species.parse(item.get('upKindCd'), item.get('upKindNm')),
+        kind_nm=_interned(item, 'kindCd'),
+        color=_interned(item, 'colorCd'),
+        age=_text(item, 'age'),
+        sex=Sex.parse(item.get('sexCd')),
+        special_mark=_text(item, 'specialMark'),
+        org_nm=_interned(item, 'orgNm'),
+        popfile=_text(item, 'popfile'),
+        call_name=_text(item, 'callName'),
+        call_tel=_text(item, 'callTel'),
+    )
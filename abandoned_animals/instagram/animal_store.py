@@ -0,0 +1,390 @@
+"""
+유기/실종동물 로컬 저장소 (SQLite)
+API 응답을 누적 저장하고, 마지막 동기화 시점(워터마크) 이후 변경분만 가져옴
+
+사용법:
+    python animal_store.py sync [--days 30]   # 변경분 동기화
+    python animal_store.py stats              # 저장 현황
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+from animal_record import lost_animal_id
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'animals.db')
+
+# 실종 신고는 늦게 올라오는 경우가 있어 워터마크보다 며칠 앞부터 다시 조회
+LOST_RESYNC_DAYS = 7
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS abandoned_animals (
+    desertion_no  TEXT PRIMARY KEY,
+    notice_sdt    TEXT,
+    happen_dt     TEXT,
+    upd_tm        TEXT,
+    process_state TEXT,
+    org_nm        TEXT,
+    data          TEXT NOT NULL,
+    first_seen    TEXT NOT NULL,
+    last_seen     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_abandoned_notice_sdt ON abandoned_animals (notice_sdt);
+CREATE INDEX IF NOT EXISTS idx_abandoned_happen_dt ON abandoned_animals (happen_dt);
+CREATE INDEX IF NOT EXISTS idx_abandoned_upd_tm ON abandoned_animals (upd_tm);
+
+CREATE TABLE IF NOT EXISTS lost_animals (
+    animal_id     TEXT PRIMARY KEY,
+    happen_dt     TEXT,
+    org_nm        TEXT,
+    content_hash  TEXT NOT NULL,
+    data          TEXT NOT NULL,
+    first_seen    TEXT NOT NULL,
+    last_seen     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lost_happen_dt ON lost_animals (happen_dt);
+
+CREATE TABLE IF NOT EXISTS state_changes (
+    kind        TEXT NOT NULL,
+    animal_key  TEXT NOT NULL,
+    field       TEXT NOT NULL,
+    old_value   TEXT,
+    new_value   TEXT,
+    changed_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_state_changes_key ON state_changes (kind, animal_key);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name       TEXT PRIMARY KEY,
+    watermark  TEXT NOT NULL,
+    synced_at  TEXT NOT NULL
+);
+"""
+
+
+def _compact_date(value: Optional[str]) -> str:
+    """'2026-01-13', '20260113' 등을 YYYYMMDD로 정규화"""
+    if not value:
+        return ''
+    return value[:10].replace('-', '')[:8]
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class AnimalStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 워터마크
+    # ------------------------------------------------------------------
+    def get_watermark(self, name: str) -> Optional[str]:
+        row = self.conn.execute('SELECT watermark FROM sync_state WHERE name = ?', (name,)).fetchone()
+        return row['watermark'] if row else None
+
+    def set_watermark(self, name: str, watermark: str):
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO sync_state (name, watermark, synced_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, synced_at = excluded.synced_at',
+                (name, watermark, now)
+            )
+
+    # ------------------------------------------------------------------
+    # upsert
+    # ------------------------------------------------------------------
+    def upsert_abandoned(self, animals: Iterable[Dict], batch_size: int = 500) -> Dict[str, int]:
+        """
+        구조동물을 desertionNo 기준으로 저장합니다.
+
+        updTm 또는 processState가 바뀐 경우에만 갱신하고, 상태 변경 이력을 남깁니다.
+
+        Returns:
+            {'inserted': n, 'updated': n, 'unchanged': n, 'max_upd_tm': '...'}
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'max_upd_tm': ''}
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        for batch in _batched(animals, batch_size):
+            with self._lock, self.conn:
+                keys = [a.get('desertionNo') for a in batch if a.get('desertionNo')]
+                placeholders = ','.join('?' * len(keys))
+                existing = {
+                    row['desertion_no']: row for row in self.conn.execute(
+                        f'SELECT desertion_no, upd_tm, process_state FROM abandoned_animals '
+                        f'WHERE desertion_no IN ({placeholders})', keys
+                    )
+                } if keys else {}
+
+                for animal in batch:
+                    key = animal.get('desertionNo')
+                    if not key:
+                        continue
+                    upd_tm = animal.get('updTm', '') or ''
+                    state = animal.get('processState', '') or ''
+                    counts['max_upd_tm'] = max(counts['max_upd_tm'], upd_tm)
+                    row = existing.get(key)
+
+                    if row and row['upd_tm'] == upd_tm and row['process_state'] == state:
+                        self.conn.execute(
+                            'UPDATE abandoned_animals SET last_seen = ? WHERE desertion_no = ?', (now, key)
+                        )
+                        counts['unchanged'] += 1
+                        continue
+
+                    values = (
+                        animal.get('noticeSdt', ''), _compact_date(animal.get('happenDt')), upd_tm, state,
+                        animal.get('orgNm', ''), json.dumps(animal, ensure_ascii=False), now, key
+                    )
+                    if row:
+                        self.conn.execute(
+                            'UPDATE abandoned_animals SET notice_sdt = ?, happen_dt = ?, upd_tm = ?, '
+                            'process_state = ?, org_nm = ?, data = ?, last_seen = ? WHERE desertion_no = ?',
+                            values
+                        )
+                        if row['process_state'] != state:
+                            self.conn.execute(
+                                'INSERT INTO state_changes VALUES (?, ?, ?, ?, ?, ?)',
+                                ('abandoned', key, 'processState', row['process_state'], state, now)
+                            )
+                        counts['updated'] += 1
+                    else:
+                        self.conn.execute(
+                            'INSERT INTO abandoned_animals (notice_sdt, happen_dt, upd_tm, process_state, '
+                            'org_nm, data, first_seen, last_seen, desertion_no) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                            values[:-1] + (now, key)
+                        )
+                        counts['inserted'] += 1
+
+        return counts
+
+    def upsert_lost(self, animals: Iterable[Dict], batch_size: int = 500) -> Dict[str, int]:
+        """
+        실종동물을 lost_animal_id 기준으로 저장합니다.
+
+        lossInfo에는 수정일 필드가 없으므로 내용 해시로 변경 여부를 판단합니다.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        for batch in _batched(animals, batch_size):
+            with self._lock, self.conn:
+                for animal in batch:
+                    key = lost_animal_id(animal)
+                    data = json.dumps(animal, ensure_ascii=False, sort_keys=True)
+                    content_hash = hashlib.sha1(data.encode('utf-8')).hexdigest()
+                    row = self.conn.execute(
+                        'SELECT content_hash FROM lost_animals WHERE animal_id = ?', (key,)
+                    ).fetchone()
+
+                    if row and row['content_hash'] == content_hash:
+                        self.conn.execute('UPDATE lost_animals SET last_seen = ? WHERE animal_id = ?', (now, key))
+                        counts['unchanged'] += 1
+                        continue
+
+                    values = (_compact_date(animal.get('happenDt')), animal.get('orgNm', ''), content_hash, data)
+                    if row:
+                        self.conn.execute(
+                            'UPDATE lost_animals SET happen_dt = ?, org_nm = ?, content_hash = ?, data = ?, '
+                            'last_seen = ? WHERE animal_id = ?', values + (now, key)
+                        )
+                        self.conn.execute(
+                            'INSERT INTO state_changes VALUES (?, ?, ?, ?, ?, ?)',
+                            ('lost', key, 'content', row['content_hash'], content_hash, now)
+                        )
+                        counts['updated'] += 1
+                    else:
+                        self.conn.execute(
+                            'INSERT INTO lost_animals (happen_dt, org_nm, content_hash, data, first_seen, last_seen, '
+                            'animal_id) VALUES (?, ?, ?, ?, ?, ?, ?)', values + (now, now, key)
+                        )
+                        counts['inserted'] += 1
+
+        return counts
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def query_abandoned(
+        self,
+        notice_date: Optional[str] = None,
+        happen_date: Optional[str] = None,
+        org_nm: Optional[str] = None,
+        process_state: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        저장된 구조동물 조회 (인덱스 사용)
+
+        Args:
+            notice_date: 공고 시작일 (YYYYMMDD)
+            happen_date: 발견일 (YYYYMMDD)
+            org_nm: 관할기관 (앞부분 일치, 예: '서울특별시')
+            process_state: 상태 (예: '보호중')
+        """
+        conditions, params = [], []
+        if notice_date:
+            conditions.append('notice_sdt = ?')
+            params.append(notice_date)
+        if happen_date:
+            conditions.append('happen_dt = ?')
+            params.append(happen_date)
+        if org_nm:
+            conditions.append('org_nm LIKE ?')
+            params.append(f'{org_nm}%')
+        if process_state:
+            conditions.append('process_state = ?')
+            params.append(process_state)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        for row in self.conn.execute(f'SELECT data FROM abandoned_animals {where}', params):
+            yield json.loads(row['data'])
+
+    def query_lost(self, bgnde: str, endde: str) -> Iterator[Dict]:
+        """실종일(YYYYMMDD)이 기간 내인 실종동물 조회"""
+        for row in self.conn.execute(
+            'SELECT data FROM lost_animals WHERE happen_dt BETWEEN ? AND ?', (bgnde, endde)
+        ):
+            yield json.loads(row['data'])
+
+    def stats(self) -> Dict:
+        result = {}
+        for table in ('abandoned_animals', 'lost_animals', 'state_changes'):
+            result[table] = self.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        result['watermarks'] = {
+            row['name']: row['watermark'] for row in self.conn.execute('SELECT name, watermark FROM sync_state')
+        }
+        return result
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def sync_abandoned(self, fetcher, initial_days: int = 30, concurrency: int = 4) -> Dict[str, int]:
+        """
+        마지막 워터마크(updTm) 이후 수정된 구조동물만 가져와 저장합니다.
+
+        워터마크가 없으면 최근 initial_days일 동안 수정된 데이터를 가져옵니다.
+        워터마크 날짜 당일은 다시 조회하고 upsert로 중복을 흡수합니다.
+        가져오지 못한 페이지가 있으면 워터마크를 그대로 두어 다음 동기화에서 같은 구간을 다시 조회합니다.
+        """
+        watermark = self.get_watermark('abandoned')
+        today = datetime.now()
+        if watermark:
+            bgupd = _compact_date(watermark)
+        else:
+            bgupd = (today - timedelta(days=initial_days)).strftime('%Y%m%d')
+        enupd = today.strftime('%Y%m%d')
+
+        print(f"🔄 구조동물 동기화: 수정일 {bgupd} ~ {enupd}")
+        failed_pages = []
+        stream = fetcher.iter_abandoned_animals(
+            state='all', bgupd=bgupd, enupd=enupd, concurrency=concurrency, failed_pages=failed_pages
+        )
+        counts = self.upsert_abandoned(stream)
+        counts['failed_pages'] = len(failed_pages)
+
+        if failed_pages:
+            print(f"   ⚠️ {len(failed_pages)}개 페이지 실패 {sorted(failed_pages)}, 워터마크 유지 ({watermark or '없음'})")
+        elif counts['max_upd_tm']:
+            self.set_watermark('abandoned', max(counts['max_upd_tm'], watermark or ''))
+        print(f"   ✅ 신규 {counts['inserted']}, 변경 {counts['updated']}, 동일 {counts['unchanged']}")
+        return counts
+
+    def sync_lost(self, fetcher, initial_days: int = 30) -> Dict[str, int]:
+        """
+        마지막 동기화 이후 실종동물을 가져와 저장합니다.
+
+        lossInfo는 수정일 조회를 지원하지 않으므로 실종일 기준으로,
+        워터마크보다 LOST_RESYNC_DAYS일 앞부터 다시 조회합니다.
+        페이지를 가져오지 못하면 워터마크를 그대로 두어 다음 동기화에서 같은 구간을 다시 조회합니다.
+        """
+        watermark = self.get_watermark('lost')
+        today = datetime.now()
+        if watermark:
+            start = datetime.strptime(watermark, '%Y%m%d') - timedelta(days=LOST_RESYNC_DAYS)
+        else:
+            start = today - timedelta(days=initial_days)
+        bgnde, endde = start.strftime('%Y%m%d'), today.strftime('%Y%m%d')
+
+        print(f"🔄 실종동물 동기화: 실종일 {bgnde} ~ {endde}")
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'failed_pages': 0}
+        page_no = 1
+        while True:
+            data = fetcher.fetch_lost_animals(num_of_rows=1000, page_no=page_no, bgnde=bgnde, endde=endde)
+            if not data:
+                print(f"   ⚠️ {page_no} 페이지를 가져오지 못했습니다.")
+                counts['failed_pages'] += 1
+                break
+            animals = fetcher.extract_items(data)
+            if not animals:
+                break
+            for key, value in self.upsert_lost(animals).items():
+                counts[key] += value
+            if page_no * 1000 >= fetcher.extract_total_count(data):
+                break
+            page_no += 1
+
+        if counts['failed_pages']:
+            print(f"   ⚠️ 워터마크 유지 ({watermark or '없음'})")
+        else:
+            self.set_watermark('lost', endde)
+        print(f"   ✅ 신규 {counts['inserted']}, 변경 {counts['updated']}, 동일 {counts['unchanged']}")
+        return counts
+
+
+def main():
+    import argparse
+    from fetch_animals import AnimalDataFetcher
+
+    parser = argparse.ArgumentParser(description='유기/실종동물 로컬 저장소')
+    parser.add_argument('command', choices=['sync', 'stats'])
+    parser.add_argument('--days', type=int, default=30, help='첫 동기화 시 가져올 기간 (기본: 30일)')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='SQLite 파일 경로')
+    args = parser.parse_args()
+
+    with AnimalStore(args.db) as store:
+        if args.command == 'sync':
+            api_key = os.getenv('ANIMAL_API_KEY')
+            if not api_key:
+                print("❌ 환경변수 ANIMAL_API_KEY가 필요합니다.")
+                return
+            fetcher = AnimalDataFetcher(api_key)
+            store.sync_abandoned(fetcher, initial_days=args.days)
+            store.sync_lost(fetcher, initial_days=args.days)
+            fetcher.http.stats.print_summary()
+
+        print(f"\n📦 저장 현황: {json.dumps(store.stats(), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
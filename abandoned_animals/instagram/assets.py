@@ -0,0 +1,160 @@
+"""
+카드 렌더링용 로컬 폰트 번들
+처음 사용할 때 assets/fonts에 내려받아 두고, HTML에는 file:// @font-face로 넣어
+렌더링 중에는 폰트 CDN에 접속하지 않음 (페이지마다 폰트 bytes를 다시 보내지 않음)
+
+사용법 (네트워크가 되는 곳에서 미리 받아두기):
+    python assets.py
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+from http_client import HttpClient
+
+FONT_DIR = os.getenv('CARD_FONT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'fonts')
+
+# family → (파일명, 내려받을 주소, 원격 CSS)
+FONT_SOURCES = {
+    'Jua': (
+        'Jua-Regular.ttf',
+        'https://github.com/google/fonts/raw/main/ofl/jua/Jua-Regular.ttf',
+        "@import url('https://fonts.googleapis.com/css2?family=Jua:wght@400&display=swap');",
+    ),
+    'BMHANNAAir': (
+        'BMHANNAAir.woff',
+        'https://fastly.jsdelivr.net/gh/projectnoonnu/noonfonts_four@1.0/BMHANNAAir.woff',
+        "@font-face { font-family: 'BMHANNAAir'; "
+        "src: url('https://fastly.jsdelivr.net/gh/projectnoonnu/noonfonts_four@1.0/BMHANNAAir.woff') format('woff'); "
+        "font-weight: normal; font-style: normal; }",
+    ),
+}
+
+# 번들 폰트가 없을 때 Pillow 렌더러가 쓸 시스템 한글 폰트
+FALLBACK_FONTS = [
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+]
+
+_FONT_FORMATS = {
+    '.ttf': 'truetype',
+    '.otf': 'opentype',
+    '.woff': 'woff',
+    '.woff2': 'woff2',
+}
+# 이번 프로세스에서 내려받기에 실패했거나 오프라인이라 없음을 알린 폰트 (카드마다 반복하지 않음)
+_failed = set()
+_offline_warned = set()
+
+
+def resolve_offline(offline: Optional[bool] = None) -> bool:
+    """오프라인 모드 여부 (인자 > RENDER_OFFLINE 환경변수)"""
+    if offline is not None:
+        return offline
+    return os.getenv('RENDER_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def download_font(family: str, http: Optional[HttpClient] = None) -> str:
+    """폰트를 FONT_DIR에 내려받아 경로 반환 (임시 파일 → 교체)"""
+    filename, url, _ = FONT_SOURCES[family]
+    path = os.path.join(FONT_DIR, filename)
+
+    client = http or HttpClient(pool_size=2)
+    try:
+        print(f"🔤 {family} 폰트 내려받는 중...")
+        response = client.get(url)
+        response.raise_for_status()
+    finally:
+        if http is None:
+            client.close()
+
+    os.makedirs(FONT_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=FONT_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(response.content)
+    os.replace(tmp_path, path)
+    return path
+
+
+def font_path(family: str, offline: Optional[bool] = None, http: Optional[HttpClient] = None) -> Optional[str]:
+    """
+    번들 폰트 경로
+
+    로컬에 없으면 내려받아 캐시하고, 오프라인 모드이거나 내려받기에 실패하면 None을 반환합니다.
+    """
+    filename = FONT_SOURCES[family][0]
+    path = os.path.join(FONT_DIR, filename)
+    if os.path.exists(path):
+        return path
+    if resolve_offline(offline):
+        if family not in _offline_warned:
+            print(f"⚠️ 오프라인 모드: {family} 폰트가 {FONT_DIR}에 없습니다.")
+            _offline_warned.add(family)
+        return None
+    if family in _failed:
+        return None
+
+    try:
+        return download_font(family, http)
+    except Exception as e:
+        print(f"⚠️ {family} 폰트를 내려받지 못했습니다: {e}")
+        _failed.add(family)
+        return None
+
+
+def missing_fonts(offline: Optional[bool] = None) -> List[str]:
+    """
+    번들 폰트를 찾지 못한 family 목록 (오프라인이거나 내려받기 실패)
+
+    이 폰트로 그릴 글자는 대체 폰트로 그려지므로, 그 카드는 렌더 캐시에 넣지 않습니다.
+    """
+    return [family for family in FONT_SOURCES if font_path(family, offline) is None]
+
+
+def system_font_path() -> Optional[str]:
+    """설치된 시스템 한글 폰트 (없으면 None)"""
+    for path in FALLBACK_FONTS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _local_font_face(family: str, path: str) -> str:
+    """번들 폰트 파일을 가리키는 @font-face (Chrome이 file://로 직접 읽음)"""
+    fmt = _FONT_FORMATS.get(os.path.splitext(path)[1].lower(), 'truetype')
+    return (
+        f"@font-face {{ font-family: '{family}'; src: url('{Path(path).resolve().as_uri()}') format('{fmt}'); "
+        f"font-weight: normal; font-style: normal; }}"
+    )
+
+
+def font_face_css(offline: Optional[bool] = None) -> str:
+    """
+    카드 HTML에 넣을 폰트 CSS
+
+    번들 폰트는 file:// 경로로 참조해 네트워크 요청이 없습니다 (페이지도 file://로 불러와야 함, RenderSession.load).
+    번들이 없을 때는 온라인이면 원격 CSS를 쓰고, 오프라인이면 생략해 sans-serif로 그립니다.
+    """
+    offline = resolve_offline(offline)
+    imports, faces = [], []
+    for family, (_, _, remote_css) in FONT_SOURCES.items():
+        path = font_path(family, offline)
+        if path:
+            faces.append(_local_font_face(family, path))
+        elif not offline:
+            # @import는 다른 규칙보다 앞에 있어야 함
+            (imports if remote_css.startswith('@import') else faces).append(remote_css)
+    return '\n        '.join(imports + faces)
+
+
+def main():
+    """번들 폰트를 모두 내려받기 (빌드 머신 준비용)"""
+    for family in FONT_SOURCES:
+        path = font_path(family, offline=False)
+        print(f"{'✅' if path else '❌'} {family}: {path or '실패'}")
+
+
+if __name__ == "__main__":
+    main()
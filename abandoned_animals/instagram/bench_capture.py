@@ -0,0 +1,84 @@
+"""
+Chrome 카드 캡처 방식 벤치마크
+PNG 캡처 → Pillow JPG 변환(기존)과 CDP JPG 캡처를 배율별로 비교해
+카드당 캡처/인코딩 시간과 결과 크기를 출력
+
+사용법:
+    python bench_capture.py [--kind abandoned|lost] [--repeat 5] [--quality 95]
+"""
+import argparse
+import io
+import time
+from PIL import Image
+from card_spec import render_html
+from compare_renderers import SAMPLES
+
+# (캡처 형식, 배율) - 첫 항목이 기존 방식
+MODES = [('png', 2), ('jpeg', 2), ('png', 1), ('jpeg', 1)]
+
+
+def bench_mode(generator_class, animal, capture: str, scale: int, repeat: int, quality: int) -> dict:
+    """한 방식으로 같은 카드를 repeat번 캡처해 평균 시간(ms)/크기 측정"""
+    generator = generator_class('chrome', scale=scale, capture=capture, quality=quality)
+    card = generator.build_card(animal)
+    width, height = generator.canvas_width, generator.canvas_height
+
+    capture_times, encode_times, sizes = [], [], []
+    with generator.session() as session:
+        session.load(render_html(card, generator.offline, session.asset_dir))
+        session.wait_until_ready()
+        session.fit_canvas()
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = session.capture_clip(0, 0, width, height, format=capture, quality=quality if capture == 'jpeg' else None)
+            captured = time.perf_counter()
+            if capture == 'png':
+                data = generator._convert_to_jpg(data)
+            encoded = time.perf_counter()
+
+            capture_times.append((captured - start) * 1000)
+            encode_times.append((encoded - captured) * 1000)
+            sizes.append(len(data))
+
+    with Image.open(io.BytesIO(data)) as image:
+        resolution = image.size
+
+    return {
+        'mode': f"{capture} x{scale}",
+        'resolution': resolution,
+        'capture_ms': sum(capture_times) / repeat,
+        'encode_ms': sum(encode_times) / repeat,
+        'bytes': sum(sizes) / repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chrome 카드 캡처 방식 벤치마크')
+    parser.add_argument('--kind', choices=list(SAMPLES), default='abandoned', help='측정할 카드 종류')
+    parser.add_argument('--repeat', type=int, default=5, help='방식별 반복 횟수 (기본: 5)')
+    parser.add_argument('--quality', type=int, default=95, help='JPG 품질 (기본: 95)')
+    args = parser.parse_args()
+
+    generator_class, animal = SAMPLES[args.kind]()
+    print(f"⏱️ {args.kind} 카드 캡처 벤치마크 ({args.repeat}회 평균, 품질 {args.quality})")
+
+    results = [
+        bench_mode(generator_class, animal, capture, scale, args.repeat, args.quality)
+        for capture, scale in MODES
+    ]
+
+    baseline = results[0]
+    baseline_total = baseline['capture_ms'] + baseline['encode_ms']
+    print(f"\n{'방식':<10} {'해상도':>11} {'캡처':>9} {'인코딩':>9} {'합계':>9} {'크기':>9}  기존 대비")
+    for result in results:
+        total = result['capture_ms'] + result['encode_ms']
+        width, height = result['resolution']
+        print(f"{result['mode']:<10} {f'{width}x{height}':>11} "
+              f"{result['capture_ms']:>7.0f}ms {result['encode_ms']:>7.0f}ms {total:>7.0f}ms "
+              f"{result['bytes'] / 1024:>7.0f}KB  "
+              f"시간 {total / baseline_total * 100:.0f}% / 크기 {result['bytes'] / baseline['bytes'] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
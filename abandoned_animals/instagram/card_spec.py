@@ -0,0 +1,329 @@
+"""
+인스타그램 카드 레이아웃 명세
+HTML(Chrome) 렌더러와 Pillow 렌더러가 같은 좌표/문구를 사용하도록 한 곳에서 정의
+"""
+import base64
+import hashlib
+import html
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from assets import font_face_css
+from disk_cache import DiskCache
+from photo_cache import photo_data_uri, photo_file_uri
+
+# 카드 디자인(레이아웃/폰트/렌더링 방식)이 바뀌면 올려서 이전 렌더 캐시를 무효화
+TEMPLATE_VERSION = 1
+
+CANVAS_WIDTH = 1080
+CANVAS_HEIGHT = 1500
+
+TEXT_COLOR = '#2C2B2B'
+LABEL_LEFT = 105
+VALUE_LEFT = 304
+
+# 폴라로이드 프레임
+POLAROID_TOP = 180
+POLAROID_ROTATION = 5  # deg (시계 방향)
+POLAROID_BG = '#F5F5F5'
+PHOTO_OFFSET = (40, 34)
+PHOTO_HEIGHT = 528
+BREED_BOTTOM = 40
+
+TITLE_TOP = 63
+TITLE_FONT_SIZE = 56
+TITLE_LINE_HEIGHT = 70
+LABEL_FONT_SIZE = 48
+LINE_HEIGHT = 49
+BREED_FONT_SIZE = 42
+
+# 특징 칸
+FEATURE_WIDTH = 657
+FEATURE_MAX_HEIGHT = 196
+
+# 카드 렌더러: chrome (HTML 스크린샷) / pillow (브라우저 없이 직접 그리기)
+RENDERERS = ('chrome', 'pillow')
+WEEKDAYS_KR = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+
+
+def resolve_renderer(name: Optional[str] = None) -> str:
+    """렌더러 이름 결정 (인자 > CARD_RENDERER 환경변수 > chrome)"""
+    renderer = (name or os.getenv('CARD_RENDERER') or 'chrome').lower()
+    if renderer not in RENDERERS:
+        raise ValueError(f"지원하지 않는 렌더러: {renderer} (가능: {', '.join(RENDERERS)})")
+    return renderer
+
+
+def card_title(date: datetime, suffix: str) -> str:
+    """예: 2026-01-13 화요일 보호동물 공고"""
+    return f"{date.strftime('%Y-%m-%d')} {WEEKDAYS_KR[date.weekday()]} {suffix}"
+
+
+def special_mark_font_size(text: str) -> int:
+    """특징 문구 길이에 따라 폰트 크기 자동 축소"""
+    text_length = len(text)
+    if text_length < 30:
+        return 48
+    elif text_length < 50:
+        return 42
+    elif text_length < 70:
+        return 36
+    return 32
+
+
+@dataclass
+class CardRow:
+    """라벨(Jua) + 값(BMHANNAAir) 한 줄"""
+    label: str
+    value: str
+    top: int
+    font_size: int = LABEL_FONT_SIZE
+    line_height: int = LINE_HEIGHT
+    width: Optional[int] = None
+    # True면 너비 안에서 글자 단위 줄바꿈, max_height를 넘는 줄은 잘라냄
+    multiline: bool = False
+    max_height: Optional[int] = None
+
+
+@dataclass
+class CardSpec:
+    title: str
+    breed: str
+    image_url: str
+    background: Tuple[str, str]
+    polaroid_left: float
+    polaroid_size: Tuple[float, float]
+    photo_width: float
+    rows: List[CardRow] = field(default_factory=list)
+    page_title: str = ''
+    photo_alt: str = ''
+    # 미리 받아 줄인 사진 (있으면 image_url 대신 data URI로 넣음)
+    photo: Optional[bytes] = None
+
+    def cache_key(self, options: Dict) -> str:
+        """
+        렌더 결과 캐시 키 (템플릿 버전 + 렌더 옵션 + 카드 문구/배치 + 사진 내용)
+
+        Args:
+            options: 결과 이미지에 영향을 주는 렌더 옵션 (렌더러, 오프라인, 배율, 캡처 형식, 품질)
+
+        제목에 대상 날짜가 들어가므로 날짜가 바뀌면 키도 바뀝니다.
+        사진을 미리 받지 못한 카드는 사진 주소로 대신합니다.
+        """
+        fields = asdict(self)
+        fields.pop('photo')
+        photo = hashlib.sha256(self.photo).hexdigest() if self.photo else self.image_url
+        return DiskCache.make_key('card', {
+            'template': TEMPLATE_VERSION,
+            'options': sorted(options.items()),
+            'card': fields,
+            'photo': photo,
+        })
+
+    def to_dict(self) -> Dict:
+        """렌더 서버로 보낼 JSON 형태 (사진은 base64)"""
+        data = asdict(self)
+        data['photo'] = base64.b64encode(self.photo).decode('ascii') if self.photo else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CardSpec':
+        """to_dict()로 만든 JSON에서 카드 명세 복원"""
+        data = dict(data)
+        data['rows'] = [CardRow(**row) for row in data.get('rows', [])]
+        data['background'] = tuple(data['background'])
+        data['polaroid_size'] = tuple(data['polaroid_size'])
+        data['photo'] = base64.b64decode(data['photo']) if data.get('photo') else None
+        return cls(**data)
+
+
+def _row_html(row: CardRow) -> str:
+    """라벨/값 한 줄을 절대 위치 div로 변환"""
+    value_style = f"left: {VALUE_LEFT}px; top: {row.top}px; font-size: {row.font_size}px; line-height: {row.line_height}px;"
+    if row.width:
+        value_style += f" width: {row.width}px;"
+    if row.max_height:
+        value_style += f" max-height: {row.max_height}px;"
+    value_class = 'value multiline' if row.multiline else 'value'
+
+    return (
+        f'        <div class="label" style="left: {LABEL_LEFT}px; top: {row.top}px;">{html.escape(row.label)}</div>\n'
+        f'        <div class="{value_class}" style="{value_style}">{html.escape(row.value)}</div>\n'
+    )
+
+
+def _photo_src(card: CardSpec, asset_dir: Optional[str] = None) -> str:
+    """사진 주소 (asset_dir이 있으면 파일로 저장해 file://, 없으면 data URI, 사진이 없으면 원본 URL)"""
+    if not card.photo:
+        return card.image_url or ''
+    if asset_dir:
+        return photo_file_uri(card.photo, asset_dir)
+    return photo_data_uri(card.photo)
+
+
+def _card_html(card: CardSpec, asset_dir: Optional[str] = None) -> str:
+    """카드 한 장의 본문 (카드마다 다른 배경/프레임 크기는 인라인 스타일)"""
+    polaroid_width, polaroid_height = card.polaroid_size
+    background_top, background_bottom = card.background
+    rows_html = '\n'.join(_row_html(row) for row in card.rows)
+    photo_src = _photo_src(card, asset_dir)
+
+    return f"""    <div class="main-container" style="background: linear-gradient(180deg, {background_top} 0%, {background_bottom} 100%);">
+        <div class="polaroid-frame" style="width: {polaroid_width}px; height: {polaroid_height}px; left: {card.polaroid_left}px;">
+            <div class="polaroid-bg"></div>
+            <div class="animal-photo" style="width: {card.photo_width}px;">
+                <img src="{html.escape(photo_src)}" alt="{html.escape(card.photo_alt)}" onerror="this.style.display='none'">
+            </div>
+            <div class="breed-name">{html.escape(card.breed)}</div>
+        </div>
+
+        <div class="title">{html.escape(card.title)}</div>
+
+{rows_html}    </div>
+"""
+
+
+def render_html(card: CardSpec, offline: Optional[bool] = None, asset_dir: Optional[str] = None) -> str:
+    """
+    카드 명세를 Chrome 렌더링용 HTML로 변환
+
+    Args:
+        offline: True면 번들 폰트만 사용하고 폰트 CDN은 참조하지 않음 (기본: RENDER_OFFLINE)
+        asset_dir: 사진을 파일로 저장할 폴더 (RenderSession.asset_dir, 없으면 data URI로 인라인)
+    """
+    return render_batch_html([card], offline, asset_dir)
+
+
+def render_batch_html(cards: List[CardSpec], offline: Optional[bool] = None, asset_dir: Optional[str] = None) -> str:
+    """
+    여러 카드를 세로로 이어 붙인 한 페이지 HTML (i번째 카드는 y = i * CANVAS_HEIGHT)
+
+    폰트 로딩/디코딩을 페이지당 한 번만 하고, 카드별로는 영역만 잘라 캡처합니다.
+    asset_dir을 주면 사진을 data URI 대신 파일로 참조해 페이지 크기가 카드 수만큼 커지지 않습니다.
+    """
+    page_title = cards[0].page_title if cards else ''
+    cards_html = '\n'.join(_card_html(card, asset_dir) for card in cards)
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(page_title)}</title>
+    <style>
+        {font_face_css(offline)}
+
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        html, body {{
+            overflow: hidden;
+            margin: 0;
+            padding: 0;
+            width: {CANVAS_WIDTH}px;
+            height: {CANVAS_HEIGHT * max(1, len(cards))}px;
+        }}
+
+        .main-container {{
+            position: relative;
+            width: {CANVAS_WIDTH}px;
+            height: {CANVAS_HEIGHT}px;
+            overflow: hidden;
+        }}
+
+        .polaroid-frame {{
+            position: absolute;
+            top: {POLAROID_TOP}px;
+            transform: rotate({POLAROID_ROTATION}deg);
+            z-index: 1;
+        }}
+
+        .polaroid-bg {{
+            position: absolute;
+            width: 100%;
+            height: 100%;
+            left: 0;
+            top: 0;
+            background: {POLAROID_BG};
+            box-shadow: 10px 10px 4px rgba(0, 0, 0, 0.25);
+        }}
+
+        .animal-photo {{
+            position: absolute;
+            height: {PHOTO_HEIGHT}px;
+            left: {PHOTO_OFFSET[0]}px;
+            top: {PHOTO_OFFSET[1]}px;
+            overflow: hidden;
+            z-index: 2;
+        }}
+
+        .animal-photo img {{
+            width: 100%;
+            height: 100%;
+            object-fit: contain;
+            object-position: center;
+        }}
+
+        .title {{
+            position: absolute;
+            width: 100%;
+            height: {TITLE_LINE_HEIGHT}px;
+            left: 0;
+            top: {TITLE_TOP}px;
+            font-family: 'Jua', sans-serif;
+            font-style: normal;
+            font-weight: 400;
+            font-size: {TITLE_FONT_SIZE}px;
+            line-height: {TITLE_LINE_HEIGHT}px;
+            text-align: center;
+            color: {TEXT_COLOR};
+            white-space: nowrap;
+        }}
+
+        .label {{
+            position: absolute;
+            font-family: 'Jua', sans-serif;
+            font-style: normal;
+            font-weight: 400;
+            font-size: {LABEL_FONT_SIZE}px;
+            line-height: {LINE_HEIGHT}px;
+            color: {TEXT_COLOR};
+            white-space: nowrap;
+        }}
+
+        .value {{
+            position: absolute;
+            font-family: 'BMHANNAAir', sans-serif;
+            font-style: normal;
+            font-weight: 400;
+            color: {TEXT_COLOR};
+            white-space: nowrap;
+        }}
+
+        .value.multiline {{
+            overflow: hidden;
+            white-space: pre-line;
+            word-break: break-all;
+        }}
+
+        .breed-name {{
+            position: absolute;
+            left: 50%;
+            bottom: {BREED_BOTTOM}px;
+            transform: translateX(-50%);
+            font-family: 'Jua', sans-serif;
+            font-size: {BREED_FONT_SIZE}px;
+            text-align: center;
+            color: {TEXT_COLOR};
+            text-shadow: 1px 1px 2px rgba(255, 255, 255, 0.8);
+            z-index: 3;
+        }}
+    </style>
+</head>
+<body>
+{cards_html}</body>
+</html>"""
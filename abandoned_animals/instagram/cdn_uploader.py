@@ -0,0 +1,338 @@
+"""
+FindYou CDN 이미지 업로더
+keep-alive 커넥션 풀로 여러 장을 동시에 올리고, 5xx/타임아웃은 재시도하며, URL은 카드 순서대로 반환
+캐러셀 이미지는 용량 상한 안에서 한 요청(multipart files 여러 개)으로 묶어 보내고, 본문은 이어 붙이지 않고 조각별로 전송
+이미 올린 적 있는 이미지(내용 해시 기준)는 업로드 기록의 URL을 그대로 사용
+"""
+import hashlib
+import os
+import posixpath
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from disk_cache import DiskCache
+from http_client import HttpClient
+
+# 동시에 보낼 요청 수
+CDN_UPLOAD_WORKERS = int(os.getenv('CDN_UPLOAD_WORKERS', '4'))
+# 한 요청에 묶을 최대 용량 (바이트, 0이면 한 장씩 업로드)
+CDN_UPLOAD_BATCH_BYTES = int(os.getenv('CDN_UPLOAD_BATCH_BYTES', str(10 * 1024 * 1024)))
+
+# 업로드 기록 (이미지 내용 해시 → CDN URL, 기본 30일)
+CDN_MANIFEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache', 'cdn')
+CDN_MANIFEST_TTL = int(os.getenv('CDN_MANIFEST_TTL', str(30 * 24 * 60 * 60)))
+
+
+class MultipartBody:
+    """
+    multipart/form-data 본문을 읽기 전용 파일 객체로 제공
+
+    파일 bytes를 하나로 이어 붙이지 않고 조각(헤더/파일/구분자)별로 읽어 보내며,
+    길이를 알 수 있어 Content-Length로 전송합니다. seek(0)으로 처음부터 다시 보낼 수 있습니다(재시도).
+    """
+
+    def __init__(self, field: str, files: List[Tuple[str, bytes, str]], boundary: Optional[str] = None):
+        """
+        Args:
+            field: 폼 필드 이름
+            files: [(파일명, bytes, Content-Type), ...]
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self._parts = []
+        for filename, data, content_type in files:
+            self._parts.append((
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                f'Content-Type: {content_type}\r\n\r\n'
+            ).encode('utf-8'))
+            self._parts.append(memoryview(data))
+            self._parts.append(b'\r\n')
+        self._parts.append(f'--{self.boundary}--\r\n'.encode('utf-8'))
+        self.length = sum(len(part) for part in self._parts)
+        self.seek(0)
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self.length
+
+    def seek(self, offset: int = 0):
+        """처음으로 되감기 (offset 0만 지원)"""
+        if offset != 0:
+            raise ValueError("MultipartBody는 처음으로만 되감을 수 있습니다.")
+        self._index = 0
+        self._offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        remaining = self.length if size is None or size < 0 else size
+        while remaining > 0 and self._index < len(self._parts):
+            part = self._parts[self._index]
+            chunk = part[self._offset:self._offset + remaining]
+            chunks.append(bytes(chunk))
+            remaining -= len(chunk)
+            self._offset += len(chunk)
+            if self._offset >= len(part):
+                self._index += 1
+                self._offset = 0
+        return b''.join(chunks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(64 * 1024)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _match_urls(names: List[str], urls: List[str]) -> List[str]:
+    """
+    응답 URL을 보낸 파일에 대응
+
+    URL 경로의 파일명에 보낸 파일명(확장자 제외)이 하나씩만 들어 있으면 이름으로 맞추고,
+    아니면 보낸 순서대로 대응합니다.
+    """
+    basenames = [posixpath.basename(urlparse(url).path) for url in urls]
+    matched = []
+    for name in names:
+        stem = os.path.splitext(name)[0]
+        candidates = [url for url, basename in zip(urls, basenames) if stem in basename]
+        if len(candidates) != 1:
+            return list(urls)
+        matched.append(candidates[0])
+    return matched if len(set(matched)) == len(matched) else list(urls)
+
+
+class CdnUploader:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        token: Optional[str] = None,
+        http: Optional[HttpClient] = None,
+        max_workers: int = CDN_UPLOAD_WORKERS,
+        batch_bytes: int = CDN_UPLOAD_BATCH_BYTES,
+        timeout: float = 60.0,
+        manifest: Optional[DiskCache] = None,
+        verify: bool = True
+    ):
+        """
+        Args:
+            url: 업로드 주소 (기본: FINDYOU_CDN_URL)
+            token: 인증 토큰 (기본: FINDYOU_CDN_TOKEN)
+            http: HTTP 클라이언트 (없으면 직접 생성)
+            max_workers: 동시에 보낼 요청 수 (기본: CDN_UPLOAD_WORKERS 또는 4)
+            batch_bytes: 한 요청에 묶을 최대 용량 (기본: CDN_UPLOAD_BATCH_BYTES 또는 10MB, 0이면 한 장씩)
+            timeout: 업로드 응답 대기 시간 (초)
+            manifest: 업로드 기록 (있으면 같은 내용의 이미지는 다시 올리지 않고 기록된 URL 사용)
+            verify: 기록된 URL을 쓰기 전에 HEAD 요청으로 아직 내려받을 수 있는지 확인
+        """
+        self.url = url or os.getenv("FINDYOU_CDN_URL")
+        self.token = token or os.getenv("FINDYOU_CDN_TOKEN")
+        self._http = http
+        self._owns_http = http is None
+        self.max_workers = max(1, max_workers)
+        self.batch_bytes = batch_bytes
+        self.timeout = timeout
+        self.manifest = manifest
+        self.verify = verify
+        self._lock = threading.Lock()
+        self.uploaded_bytes = 0
+        self.requests = 0
+        self.reused = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def http(self) -> HttpClient:
+        if self._http is None:
+            self._http = HttpClient(pool_size=self.max_workers, read_timeout=self.timeout)
+        return self._http
+
+    def close(self):
+        if self._owns_http and self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def upload_batch(self, images: List[Dict]) -> List[str]:
+        """
+        이미지 여러 장을 한 요청으로 업로드하고 보낸 순서대로 URL 반환 (실패하면 예외)
+
+        파일명이 카드 내용으로 정해지므로 (렌더 캐시 키) 재시도해도 같은 파일을 다시 올릴 뿐입니다.
+        """
+        body = MultipartBody('files', [(image['name'], image['data'], 'image/jpeg') for image in images])
+        response = self.http.post(
+            self.url,
+            headers={"Authorization": f"Bearer {self.token}", "Content-Type": body.content_type},
+            data=body,
+        )
+        with self._lock:
+            self.requests += 1
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: {response.text[:200]}")
+
+        data = response.json()
+        urls = data.get('data', {}).get('urls') if data.get('success') else None
+        if not urls:
+            raise Exception(f"업로드 실패: {data}")
+        if len(urls) != len(images):
+            raise Exception(f"응답 URL 개수 불일치 ({len(urls)}/{len(images)})")
+
+        with self._lock:
+            self.uploaded_bytes += sum(len(image['data']) for image in images)
+        return _match_urls([image['name'] for image in images], urls)
+
+    def upload_one(self, image: Dict) -> str:
+        """이미지 한 장 업로드 후 URL 반환 (실패하면 예외)"""
+        return self.upload_batch([image])[0]
+
+    def _manifest_key(self, image: Dict) -> str:
+        """업로드 기록 키 (업로드 주소 + 이미지 내용 해시, 파일명과 무관)"""
+        return DiskCache.make_key('cdn-upload', {
+            'cdn': self.url,
+            'sha256': hashlib.sha256(image['data']).hexdigest(),
+        })
+
+    def _lookup(self, key: str) -> Optional[str]:
+        """이전에 같은 내용을 올린 URL (기록이 없거나 만료/확인 실패면 None)"""
+        entry = self.manifest.get_json(key)
+        if not entry:
+            return None
+        if self.verify:
+            try:
+                response = self.http.head(entry['url'], timeout=5.0, retries=0, allow_redirects=True)
+                if response.status_code in (405, 501):
+                    # HEAD를 지원하지 않으면 첫 1바이트만 요청
+                    response = self.http.get(entry['url'], timeout=5.0, retries=0, headers={'Range': 'bytes=0-0'})
+                if response.status_code not in (200, 206):
+                    print(f"   ⚠️ 기록된 URL을 쓸 수 없어 다시 올립니다 (HTTP {response.status_code}): {entry['url']}")
+                    return None
+            except Exception as e:
+                print(f"   ⚠️ 기록된 URL 확인 실패, 다시 올립니다: {e}")
+                return None
+        return entry['url']
+
+    def _remember(self, key: str, image: Dict, url: str):
+        if self.manifest is not None:
+            self.manifest.set_json(key, {
+                'url': url,
+                'name': image['name'],
+                'size': len(image['data']),
+                'uploaded_at': time.time(),
+            })
+
+    def _batches(self, images: List[Dict], indices: List[int]) -> List[List[int]]:
+        """카드 순서를 유지하며 용량 상한 안에서 묶기 (상한보다 큰 이미지는 혼자 한 묶음)"""
+        if not self.batch_bytes:
+            return [[i] for i in indices]
+
+        batches, current, size = [], [], 0
+        for i in indices:
+            image = images[i]
+            if current and size + len(image['data']) > self.batch_bytes:
+                batches.append(current)
+                current, size = [], 0
+            current.append(i)
+            size += len(image['data'])
+        if current:
+            batches.append(current)
+        return batches
+
+    def upload(self, images: List[Dict]) -> List[Optional[str]]:
+        """
+        여러 장을 업로드 (용량 상한 안에서 묶은 요청들을 동시에 전송)
+
+        1. 업로드 기록에 같은 내용이 있으면 (확인 후) 그 URL을 사용하고
+        2. 이번 목록 안에서 내용이 같은 이미지는 한 번만 올리며
+        3. 묶음 요청이 실패하면 그 묶음만 한 장씩 다시 올립니다.
+
+        Returns:
+            입력 순서대로 URL 목록 (실패한 이미지는 None)
+        """
+        if not self.url or not self.token:
+            raise Exception("FINDYOU_CDN_URL, FINDYOU_CDN_TOKEN 환경변수가 필요합니다.")
+        if not images:
+            return []
+
+        start = time.perf_counter()
+        urls: List[Optional[str]] = [None] * len(images)
+        keys = [self._manifest_key(image) for image in images]
+        reused = 0
+
+        def report(i: int, error: Optional[Exception] = None, reused: bool = False):
+            if error is not None:
+                print(f"   ❌ [{i + 1}/{len(images)}] {images[i]['name']} 업로드 실패: {error}")
+            else:
+                print(f"   {'♻️' if reused else '✅'} [{i + 1}/{len(images)}] {images[i]['name']} → {urls[i]}")
+
+        def uploaded(i: int, url: str):
+            urls[i] = url
+            self._remember(keys[i], images[i], url)
+            report(i)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 1. 이전에 올린 이미지 (기록 확인은 동시에)
+            if self.manifest is not None:
+                for i, url in enumerate(executor.map(self._lookup, keys)):
+                    if url:
+                        urls[i] = url
+                        reused += 1
+                        report(i, reused=True)
+
+            # 2. 남은 이미지 중 내용이 같은 것은 첫 번째만 업로드
+            first: Dict[str, int] = {}
+            duplicates: Dict[int, int] = {}
+            for i, key in enumerate(keys):
+                if urls[i] is None:
+                    if key in first:
+                        duplicates[i] = first[key]
+                    else:
+                        first[key] = i
+            pending = list(first.values())
+
+            futures = {
+                executor.submit(self.upload_batch, [images[i] for i in batch]): batch
+                for batch in self._batches(images, pending)
+            }
+            retry_one = []
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    for i, url in zip(batch, future.result()):
+                        uploaded(i, url)
+                except Exception as e:
+                    if len(batch) == 1:
+                        report(batch[0], e)
+                    else:
+                        print(f"   ⚠️ {len(batch)}장 묶음 업로드 실패, 한 장씩 다시 올립니다: {e}")
+                        retry_one.extend(batch)
+
+            singles = {executor.submit(self.upload_one, images[i]): i for i in retry_one}
+            for future in as_completed(singles):
+                i = singles[future]
+                try:
+                    uploaded(i, future.result())
+                except Exception as e:
+                    report(i, e)
+
+        for i, original in duplicates.items():
+            urls[i] = urls[original]
+            if urls[i]:
+                reused += 1
+                report(i, reused=True)
+        self.reused += reused
+
+        elapsed = time.perf_counter() - start
+        done = sum(1 for url in urls if url)
+        print(f"📤 CDN 업로드: {done}/{len(images)}장 (기존 URL 재사용 {reused}장), "
+              f"{self.uploaded_bytes / 1024:.0f}KB, 요청 {self.requests}회, {elapsed:.1f}초 "
+              f"(동시 {self.max_workers}개, 재시도 {self.http.stats.retries}회)")
+        return urls
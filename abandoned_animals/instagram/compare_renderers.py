@@ -0,0 +1,145 @@
+"""
+Chrome 렌더러와 Pillow 렌더러 결과 비교
+같은 카드 명세를 두 방식으로 그려 픽셀 차이가 허용 범위 안인지 확인
+(사진은 합성 이미지를 카드에 직접 넣어 네트워크 없이 항상 같은 결과, 범위를 넘으면 종료 코드 1)
+
+사용법:
+    python compare_renderers.py [--kind all|abandoned|lost] [--offline] [--max-mean 8] [--max-ratio 0.05] [--output-dir compare_output]
+
+CI: .github/workflows/render_check.yml에서 렌더러 관련 파일이 바뀔 때마다 --kind all --offline으로 실행
+"""
+import argparse
+import io
+import os
+import sys
+from datetime import datetime
+from PIL import Image, ImageChops, ImageStat
+from animal_record import parse_abandoned, parse_lost
+from card_spec import render_html
+from create_image import ImageGenerator
+from create_image_lost import LostAnimalImageGenerator
+
+# 글자 안티앨리어싱 차이는 무시하고, 눈에 띄는 차이만 센다
+PIXEL_THRESHOLD = 48
+
+SAMPLES = {
+    'abandoned': lambda: (ImageGenerator, parse_abandoned({
+        'desertionNo': '411300202600027',
+        'noticeNo': '서울-마포-2026-00012',
+        'noticeSdt': '20260113',
+        'kindNm': '믹스견',
+        'sexCd': 'F',
+        'careNm': '마포구 동물보호센터',
+        'specialMark': '겁이 많고 온순함, 목줄 착용, 왼쪽 귀에 작은 상처가 있음',
+        'popfile1': 'https://www.animal.go.kr/files/shelter/2026/01/202601121401514.jpg',
+    })),
+    'lost': lambda: (LostAnimalImageGenerator, parse_lost({
+        'kindCd': '진도견',
+        'sexCd': 'F',
+        'happenDt': '20260112',
+        'happenPlace': '공장지대',
+        'orgNm': '경기도 양주시 백석읍 중앙로 33',
+        'specialMark': '공장에서 키우는 진도개인데 목줄을 끊고 없어졌어요ㅠ',
+        'popfile': 'https://www.animal.go.kr/files/shelter/2026/01/202601121401514_s.jpg',
+    })),
+}
+
+
+def sample_photo() -> bytes:
+    """비교용 합성 사진 JPG (그라데이션 + 도형, 매번 같은 bytes)"""
+    from PIL import ImageDraw
+
+    image = Image.merge('RGB', (
+        Image.linear_gradient('L').resize((640, 480)),
+        Image.linear_gradient('L').rotate(90).resize((640, 480)),
+        Image.new('L', (640, 480), 140),
+    ))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((180, 100, 460, 380), fill=(230, 190, 120))
+    draw.rectangle((40, 360, 600, 440), fill=(60, 90, 60))
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def render_chrome(generator, card) -> Image.Image:
+    with generator.session() as session:
+        session.load(render_html(card, generator.offline, session.asset_dir))
+        session.wait_until_ready()
+        session.fit_canvas()
+        png = session.screenshot_png()
+    return Image.open(io.BytesIO(png)).convert('RGB')
+
+
+def compare(chrome_img: Image.Image, pillow_img: Image.Image):
+    """
+    Returns:
+        (채널 평균 절대 차이 0~255, 임계값을 넘는 픽셀 비율, 차이 이미지)
+    """
+    if pillow_img.size != chrome_img.size:
+        pillow_img = pillow_img.resize(chrome_img.size, Image.LANCZOS)
+
+    diff = ImageChops.difference(chrome_img, pillow_img)
+    mean_diff = sum(ImageStat.Stat(diff).mean) / 3
+
+    # 채널 중 최대 차이가 임계값을 넘는 픽셀 비율
+    r, g, b = diff.split()
+    strongest = ImageChops.lighter(ImageChops.lighter(r, g), b)
+    over = strongest.point(lambda v: 255 if v > PIXEL_THRESHOLD else 0)
+    ratio = ImageStat.Stat(over).mean[0] / 255
+    return mean_diff, ratio, diff
+
+
+def check(kind: str, args, prefix: str) -> bool:
+    """한 종류의 샘플 카드를 두 렌더러로 그려 비교 (허용 범위 안이면 True)"""
+    generator_class, animal = SAMPLES[kind]()
+
+    print(f"🔍 {kind} 카드 렌더러 비교")
+    chrome = generator_class('chrome', offline=args.offline, server=None)
+    card = chrome.build_card(animal)
+    card.photo = sample_photo()
+    chrome_img = render_chrome(chrome, card)
+    chrome_img.save(f"{prefix}_chrome.png")
+
+    with generator_class('pillow', offline=args.offline, server=None).session() as session:
+        pillow_img = session.render(card)
+    pillow_img.save(f"{prefix}_pillow.png")
+
+    mean_diff, ratio, diff = compare(chrome_img, pillow_img)
+    diff.save(f"{prefix}_diff.png")
+
+    print(f"   평균 차이: {mean_diff:.2f} (허용 {args.max_mean})")
+    print(f"   차이 픽셀: {ratio * 100:.2f}% (허용 {args.max_ratio * 100:.2f}%)")
+    print(f"   결과 이미지: {prefix}_*.png")
+
+    if mean_diff > args.max_mean or ratio > args.max_ratio:
+        print("❌ 허용 범위를 넘었습니다.")
+        return False
+    print("✅ 허용 범위 안입니다.")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chrome/Pillow 카드 렌더러 픽셀 비교')
+    parser.add_argument('--kind', choices=['all'] + list(SAMPLES), default='all', help='비교할 카드 종류 (기본: all)')
+    parser.add_argument('--offline', action='store_true', help='두 렌더러 모두 로컬 폰트 번들만 사용')
+    parser.add_argument('--max-mean', type=float, default=8.0, help='허용할 채널 평균 차이 (0~255, 기본: 8)')
+    parser.add_argument('--max-ratio', type=float, default=0.05, help=f'허용할 차이 픽셀 비율 (차이 > {PIXEL_THRESHOLD}, 기본: 0.05)')
+    parser.add_argument('--output-dir', default='compare_output', help='결과 이미지 저장 폴더')
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    kinds = list(SAMPLES) if args.kind == 'all' else [args.kind]
+
+    failed = [
+        kind for kind in kinds
+        if not check(kind, args, os.path.join(args.output_dir, f"{kind}_{stamp}"))
+    ]
+    if failed:
+        print(f"\n❌ 렌더러 차이 허용 범위 초과: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
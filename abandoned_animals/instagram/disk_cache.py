@@ -0,0 +1,135 @@
+"""
+로컬 디스크 캐시 (content-addressed, TTL + 용량 제한 LRU)
+같은 요청을 반복할 때 네트워크/API 할당량을 쓰지 않도록 응답을 보관
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# 캐시 키에서 제외할 파라미터 (인증 정보)
+SECRET_PARAMS = ('serviceKey', 'access_token')
+
+
+class DiskCache:
+    def __init__(self, cache_dir: str, ttl: float = 3600, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            ttl: 유효 시간 (초). 지나면 stale 항목으로만 사용
+            max_bytes: 캐시 최대 용량. 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+
+        항목의 mtime은 저장 시각(TTL 기준), atime은 마지막 사용 시각(LRU 기준)으로 사용합니다.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None, exclude: Iterable[str] = SECRET_PARAMS) -> str:
+        """엔드포인트 + 정렬된 파라미터(인증키 제외)로 캐시 키 생성"""
+        normalized = sorted(
+            (str(k), str(v)) for k, v in (params or {}).items()
+            if k not in exclude and v is not None
+        )
+        raw = json.dumps([endpoint, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[bytes]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+            allow_stale: True면 TTL이 지난 항목도 반환 (stale-if-error 용도)
+        """
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if not allow_stale and time.time() - stat.st_mtime > self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+            # LRU: 마지막 사용 시각 갱신 (저장 시각은 유지)
+            os.utime(path, (time.time(), stat.st_mtime))
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"⚠️ 캐시 읽기 실패: {e}")
+            return None
+
+    def set(self, key: str, data: bytes):
+        """캐시 저장 (임시 파일에 쓴 뒤 원자적으로 교체)"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ 캐시 저장 실패: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self.evict()
+
+    def get_json(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        data = self.get(key, allow_stale=allow_stale)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def set_json(self, key: str, value: Any):
+        self.set(key, json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    yield path, os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def evict(self):
+        """용량 제한을 넘으면 마지막 사용 시각이 오래된 항목부터 삭제"""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[1].st_atime)
+            total = sum(stat.st_size for _, stat in entries)
+            # 한 번에 여유 공간을 확보해 eviction 빈도를 줄임
+            target = self.max_bytes * 0.9
+            for path, stat in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= stat.st_size
+                except FileNotFoundError:
+                    continue
+            self._total_bytes = total
@@ -3,23 +3,126 @@
 """
 import requests
 import json
+import math
 import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from dotenv import load_dotenv
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional
 from urllib.parse import unquote
+from http_client import HttpClient
+from disk_cache import DiskCache
+from animal_store import AnimalStore
 
 load_dotenv()
 
+# API 응답 캐시 디렉토리 및 유효 시간 (초)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache', 'api')
+DEFAULT_CACHE_TTL = int(os.getenv('ANIMAL_API_CACHE_TTL', '3600'))
+
+# 시도 코드 (upr_cd)
+SIDO_CODES = {
+    "6110000": "서울특별시",
+    "6260000": "부산광역시",
+    "6270000": "대구광역시",
+    "6280000": "인천광역시",
+    "6290000": "광주광역시",
+    "5690000": "세종특별자치시",
+    "6300000": "대전광역시",
+    "6310000": "울산광역시",
+    "6410000": "경기도",
+    "6530000": "강원특별자치도",
+    "6430000": "충청북도",
+    "6440000": "충청남도",
+    "6540000": "전북특별자치도",
+    "6460000": "전라남도",
+    "6470000": "경상북도",
+    "6480000": "경상남도",
+    "6500000": "제주특별자치도",
+}
+
+
+def reservoir_sample(iterable: Iterable, k: int) -> List:
+    """
+    스트림에서 k개를 균등 확률로 무작위 추출합니다 (메모리 O(k)).
+    
+    Args:
+        iterable: 추출 대상 (제너레이터 가능)
+        k: 추출할 개수
+    
+    Returns:
+        추출된 항목 리스트 (항목 수가 k보다 적으면 전체)
+    """
+    reservoir = []
+    for i, item in enumerate(iterable):
+        if i < k:
+            reservoir.append(item)
+        else:
+            j = random.randint(0, i)
+            if j < k:
+                reservoir[j] = item
+    return reservoir
+
+
 class AnimalDataFetcher:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        http: Optional[HttpClient] = None,
+        cache: Optional[DiskCache] = None
+    ):
         """
         Args:
             api_key: 공공데이터포털 API 인증키 (URL 인코딩된 형태)
+            http: 공유할 HTTP 클라이언트 (없으면 새 커넥션 풀 생성)
+            cache: API 응답 디스크 캐시 (없으면 캐시 사용 안 함)
         """
         # API 키가 인코딩되어 있다면 디코딩
         self.api_key = unquote(api_key)
         self.base_url = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2"
+        self.loss_url = "https://apis.data.go.kr/1543061/lossInfoService/lossInfo"
+        # keep-alive 커넥션 풀 + 재시도 (호출마다 TCP/TLS 핸드셰이크 방지)
+        self.http = http or HttpClient()
+        self.cache = cache
+    
+    @staticmethod
+    def _is_cacheable(data: Dict) -> bool:
+        """정상 응답만 캐시 (resultCode가 있으면 00이어야 함)"""
+        if not isinstance(data, dict) or 'response' not in data:
+            return False
+        header = data['response'].get('header') or {}
+        return header.get('resultCode', '00') == '00'
+    
+    def _get_json(self, endpoint: str, params: Dict) -> Dict:
+        """
+        캐시를 거쳐 GET 요청 후 JSON 응답을 반환합니다.
+        
+        캐시가 유효하면 네트워크를 사용하지 않고, 요청이 실패하면
+        유효 시간이 지난 캐시라도 있으면 대신 반환합니다 (stale-if-error).
+        """
+        key = DiskCache.make_key(endpoint, params) if self.cache else None
+        
+        if key:
+            cached = self.cache.get_json(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            response = self.http.get(endpoint, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, json.JSONDecodeError):
+            stale = self.cache.get_json(key, allow_stale=True) if key else None
+            if stale is None:
+                raise
+            print("⚠️ API 요청 실패 - 만료된 캐시 응답 사용")
+            return stale
+        
+        if key and self._is_cacheable(data):
+            self.cache.set_json(key, data)
+        return data
         
     def fetch_abandoned_animals(
         self, 
@@ -29,7 +132,9 @@ class AnimalDataFetcher:
         state: str = "notice",  # notice: 공고중, protect: 보호중
         bgnde: Optional[str] = None,  # 시작일 (YYYYMMDD)
         endde: Optional[str] = None,  # 종료일 (YYYYMMDD)
-        upr_cd: Optional[str] = None  # 시도 코드 (6110000: 서울, 6410000: 경기)
+        upr_cd: Optional[str] = None,  # 시도 코드 (6110000: 서울, 6410000: 경기)
+        bgupd: Optional[str] = None,  # 수정일 시작 (YYYYMMDD)
+        enupd: Optional[str] = None  # 수정일 종료 (YYYYMMDD)
     ) -> Dict:
         """
         유기동물 정보를 조회합니다.
@@ -42,6 +147,8 @@ class AnimalDataFetcher:
             bgnde: 시작일 (YYYYMMDD)
             endde: 종료일 (YYYYMMDD)
             upr_cd: 시도 코드 (6110000: 서울, 6410000: 경기 등)
+            bgupd: 수정일 시작 (YYYYMMDD)
+            enupd: 수정일 종료 (YYYYMMDD)
         
         Returns:
             API 응답 데이터
@@ -70,12 +177,14 @@ class AnimalDataFetcher:
         if upr_cd:
             params['upr_cd'] = upr_cd
         
+        if bgupd:
+            params['bgupd'] = bgupd
+        
+        if enupd:
+            params['enupd'] = enupd
+        
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data
+            return self._get_json(endpoint, params)
         except requests.exceptions.RequestException as e:
             print(f"API 요청 중 오류 발생: {e}")
             return {}
@@ -83,42 +192,203 @@ class AnimalDataFetcher:
             print(f"JSON 파싱 중 오류 발생: {e}")
             return {}
     
-    def get_recent_animals(self, count: int = 5) -> List[Dict]:
+    def fetch_lost_animals(
+        self,
+        num_of_rows: int = 1000,
+        page_no: int = 1,
+        bgnde: Optional[str] = None,
+        endde: Optional[str] = None
+    ) -> Dict:
         """
-        최신 공고 동물 정보를 가져옵니다.
+        실종동물 정보를 조회합니다 (lossInfo).
         
         Args:
-            count: 가져올 동물 수
+            num_of_rows: 한 페이지 결과 수 (최대 1000)
+            page_no: 페이지 번호
+            bgnde: 시작일 (YYYYMMDD)
+            endde: 종료일 (YYYYMMDD)
         
         Returns:
-            동물 정보 리스트
+            API 응답 데이터
         """
-        data = self.fetch_abandoned_animals(num_of_rows=100, page_no=1, state="notice")
+        params = {
+            'serviceKey': self.api_key,
+            'numOfRows': str(num_of_rows),
+            'pageNo': str(page_no),
+            '_type': 'json'
+        }
         
-        if not data or 'response' not in data:
-            print("데이터를 가져올 수 없습니다.")
-            return []
+        if bgnde:
+            params['bgnde'] = bgnde
         
-        response = data['response']
+        if endde:
+            params['endde'] = endde
         
-        # API 응답 구조 확인
-        if 'body' not in response or 'items' not in response['body']:
-            print("응답 데이터 구조가 올바르지 않습니다.")
+        try:
+            return self._get_json(self.loss_url, params)
+        except requests.exceptions.RequestException as e:
+            print(f"API 요청 중 오류 발생: {e}")
+            return {}
+        except json.JSONDecodeError as e:
+            print(f"JSON 파싱 중 오류 발생: {e}")
+            return {}
+    
+    @staticmethod
+    def extract_items(data: Dict) -> List[Dict]:
+        """
+        API 응답에서 동물 리스트를 추출합니다.
+        
+        items가 빈 문자열이거나 단일 항목(dict)인 경우도 리스트로 정규화합니다.
+        """
+        if not data or 'response' not in data:
             return []
         
-        items = response['body']['items']
+        body = data['response'].get('body') or {}
+        items = body.get('items')
         
-        # items가 딕셔너리인 경우 (item 키 확인)
         if isinstance(items, dict) and 'item' in items:
             animals = items['item']
         else:
-            animals = items
+            animals = items or []
         
-        # 단일 항목인 경우 리스트로 변환
         if isinstance(animals, dict):
             animals = [animals]
         
-        return animals[:count]
+        return animals
+    
+    @staticmethod
+    def extract_total_count(data: Dict) -> int:
+        """API 응답에서 totalCount를 추출합니다."""
+        if not data or 'response' not in data:
+            return 0
+        body = data['response'].get('body') or {}
+        try:
+            return int(body.get('totalCount', 0))
+        except (TypeError, ValueError):
+            return 0
+    
+    def iter_abandoned_animals(
+        self,
+        num_of_rows: int = 1000,
+        concurrency: int = 1,
+        failed_pages: Optional[List[int]] = None,
+        **filters
+    ) -> Iterator[Dict]:
+        """
+        조건에 맞는 유기동물 전체를 페이지를 넘겨가며 한 마리씩 반환합니다.
+        
+        첫 페이지의 totalCount로 전체 페이지 수를 계산하고,
+        concurrency > 1이면 다음 페이지들을 미리 동시에 요청합니다.
+        페이지 순서는 유지되며, 메모리에는 최대 concurrency개 페이지만 올라갑니다.
+        
+        Args:
+            num_of_rows: 한 페이지 결과 수 (최대 1000)
+            concurrency: 동시에 요청할 페이지 수
+            failed_pages: 주면 가져오지 못한 페이지 번호를 담음 (빠진 데이터가 있는지 확인용)
+            **filters: fetch_abandoned_animals의 조회 조건 (upkind, state, bgnde, endde, upr_cd, bgupd, enupd)
+        
+        Yields:
+            동물 정보 (dict)
+        """
+        first_page = self.fetch_abandoned_animals(num_of_rows=num_of_rows, page_no=1, **filters)
+        if not first_page and failed_pages is not None:
+            failed_pages.append(1)
+        total_count = self.extract_total_count(first_page)
+        total_pages = math.ceil(total_count / num_of_rows) if total_count else 1
+        
+        yield from self.extract_items(first_page)
+        del first_page
+        
+        if total_pages <= 1:
+            return
+        
+        def fetch_page(page_no):
+            data = self.fetch_abandoned_animals(num_of_rows=num_of_rows, page_no=page_no, **filters)
+            if not data:
+                print(f"⚠️ {page_no}/{total_pages} 페이지를 가져오지 못했습니다.")
+                if failed_pages is not None:
+                    failed_pages.append(page_no)
+            return self.extract_items(data)
+        
+        pages = iter(range(2, total_pages + 1))
+        
+        if concurrency <= 1:
+            for page_no in pages:
+                yield from fetch_page(page_no)
+            return
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = deque()
+            for page_no in pages:
+                pending.append(executor.submit(fetch_page, page_no))
+                if len(pending) >= concurrency:
+                    break
+            
+            while pending:
+                animals = pending.popleft().result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append(executor.submit(fetch_page, next_page))
+                yield from animals
+    
+    def fetch_regions(
+        self,
+        upr_cds: Iterable[Optional[str]],
+        max_workers: int = 4,
+        page_concurrency: int = 1,
+        collect: Optional[Callable[[Optional[str], Iterator[Dict]], Any]] = None,
+        **filters
+    ) -> Dict[Optional[str], Any]:
+        """
+        여러 시도를 동시에 조회합니다.
+        
+        Args:
+            upr_cds: 조회할 시도 코드 목록 (None은 전국)
+            max_workers: 동시에 조회할 시도 수
+            page_concurrency: 시도별로 동시에 요청할 페이지 수
+            collect: (upr_cd, 동물 스트림)을 받아 결과를 만드는 함수 (기본: 리스트로 수집)
+            **filters: iter_abandoned_animals 조회 조건 (upr_cd 제외)
+        
+        Returns:
+            upr_cd별 결과 (조회 실패한 시도는 빈 리스트)
+        """
+        upr_cds = list(dict.fromkeys(upr_cds))
+        if collect is None:
+            collect = lambda upr_cd, stream: list(stream)
+        
+        def fetch_region(upr_cd):
+            stream = self.iter_abandoned_animals(concurrency=page_concurrency, upr_cd=upr_cd, **filters)
+            return collect(upr_cd, stream)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(upr_cds)))) as executor:
+            futures = {upr_cd: executor.submit(fetch_region, upr_cd) for upr_cd in upr_cds}
+            for upr_cd, future in futures.items():
+                try:
+                    results[upr_cd] = future.result()
+                except Exception as e:
+                    print(f"⚠️ {SIDO_CODES.get(upr_cd, upr_cd or '전국')} 조회 실패: {e}")
+                    results[upr_cd] = []
+        
+        return results
+    
+    def get_recent_animals(self, count: int = 5) -> List[Dict]:
+        """
+        최신 공고 동물 정보를 가져옵니다.
+        
+        Args:
+            count: 가져올 동물 수
+        
+        Returns:
+            동물 정보 리스트
+        """
+        data = self.fetch_abandoned_animals(num_of_rows=100, page_no=1, state="notice")
+        
+        if not data or 'response' not in data:
+            print("데이터를 가져올 수 없습니다.")
+            return []
+        
+        return self.extract_items(data)[:count]
     
     def save_to_json(self, data: List[Dict], filepath: str):
         """
@@ -140,7 +410,7 @@ def main():
     # 환경변수에서 API 키 가져오기 (없으면 기본값 사용)
     api_key = os.getenv('ANIMAL_API_KEY')
     
-    fetcher = AnimalDataFetcher(api_key)
+    fetcher = AnimalDataFetcher(api_key, cache=DiskCache(DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL))
     
     # 최신 5마리 데이터 가져오기
     animals = fetcher.get_recent_animals(count=5)
@@ -161,6 +431,12 @@ def main():
     # 데이터 저장
     fetcher.save_to_json(animals, output_file)
     
+    # 로컬 저장소에 누적
+    with AnimalStore() as store:
+        counts = store.upsert_abandoned(animals)
+    print(f"📦 로컬 저장소: 신규 {counts['inserted']}, 변경 {counts['updated']}, 동일 {counts['unchanged']}")
+    fetcher.http.stats.print_summary()
+    
     # 간단한 정보 출력
     print(f"\n총 {len(animals)}마리의 동물 정보를 가져왔습니다:")
     for i, animal in enumerate(animals, 1):
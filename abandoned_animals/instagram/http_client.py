@@ -0,0 +1,146 @@
+"""
+외부 API 호출용 공용 HTTP 클라이언트
+keep-alive 커넥션 풀, 지수 백오프(지터) 재시도, 요청별 지연시간 통계를 제공
+"""
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RequestStats:
+    """요청 지연시간 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.retries = 0
+        self.failures = 0
+
+    def record(self, label: str, elapsed: float):
+        with self._lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """엔드포인트별 요청 수 / 평균 / p50 / p95 / 최대 지연시간(ms)"""
+        with self._lock:
+            snapshot = {label: sorted(values) for label, values in self.latencies.items()}
+
+        result = {}
+        for label, values in snapshot.items():
+            count = len(values)
+            result[label] = {
+                'count': count,
+                'mean_ms': round(sum(values) / count * 1000, 1),
+                'p50_ms': round(values[count // 2] * 1000, 1),
+                'p95_ms': round(values[min(count - 1, int(count * 0.95))] * 1000, 1),
+                'max_ms': round(values[-1] * 1000, 1),
+            }
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\n📈 HTTP 요청 통계 (재시도 {self.retries}회, 최종 실패 {self.failures}회)")
+        for label, s in summary.items():
+            print(f"   {label}: {s['count']}회, 평균 {s['mean_ms']}ms, "
+                  f"p50 {s['p50_ms']}ms, p95 {s['p95_ms']}ms, 최대 {s['max_ms']}ms")
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_size: int = 16,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        """
+        Args:
+            pool_size: 호스트당 유지할 keep-alive 커넥션 수
+            connect_timeout: 연결 타임아웃 (초)
+            read_timeout: 응답 읽기 타임아웃 (초)
+            max_retries: 5xx/타임아웃 시 최대 재시도 횟수
+            backoff_base: 백오프 기본 대기시간 (초)
+            backoff_max: 백오프 최대 대기시간 (초)
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = RequestStats()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter 지수 백오프 대기시간"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        재시도를 포함한 HTTP 요청
+
+        5xx/429 응답과 타임아웃/연결 오류는 재시도하고,
+        재시도를 모두 소진하면 마지막 응답을 반환하거나 예외를 다시 발생시킵니다.
+        """
+        max_retries = self.max_retries if retries is None else retries
+        kwargs.setdefault('timeout', self.timeout)
+        label = f"{method.upper()} {urlparse(url).path}"
+
+        attempt = 0
+        body = kwargs.get('data')
+        while True:
+            # 스트리밍 본문(파일 객체)은 재시도할 때 처음부터 다시 보냄
+            if attempt and hasattr(body, 'seek'):
+                body.seek(0)
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                self.stats.record(label, time.perf_counter() - start)
+                if attempt >= max_retries:
+                    self.stats.record_failure()
+                    raise
+            else:
+                self.stats.record(label, time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                if attempt >= max_retries:
+                    self.stats.record_failure()
+                    return response
+
+            self.stats.record_retry()
+            time.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self):
+        self.session.close()
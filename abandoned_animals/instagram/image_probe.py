@@ -0,0 +1,88 @@
+"""
+이미지 URL 접근 가능 여부 확인 (HEAD 요청)
+공유 커넥션 풀로 동시에 확인하고, 필요한 수만큼 찾으면 중단하며, 결과는 TTL 캐시에 보관
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence
+from disk_cache import DiskCache
+from http_client import HttpClient
+
+
+class ImageProber:
+    def __init__(
+        self,
+        http: HttpClient,
+        cache: Optional[DiskCache] = None,
+        max_workers: int = 8,
+        timeout: float = 5.0,
+        negative_ttl: float = 600
+    ):
+        """
+        Args:
+            http: 공유 HTTP 클라이언트
+            cache: 확인 결과 캐시 (성공 결과는 캐시 TTL 동안 유지)
+            max_workers: 동시에 확인할 URL 수
+            timeout: HEAD 요청 타임아웃 (초)
+            negative_ttl: 실패 결과를 유지할 시간 (초). 일시적 장애일 수 있어 짧게 유지
+        """
+        self.http = http
+        self.cache = cache
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self.probed = 0
+        self.cache_hits = 0
+
+    def is_available(self, url: str) -> bool:
+        """이미지 URL이 200을 반환하는지 확인 (캐시 우선)"""
+        key = DiskCache.make_key('image-probe', {'url': url}) if self.cache else None
+
+        if key:
+            cached = self.cache.get_json(key)
+            if cached is not None and (cached['ok'] or time.time() - cached['checked_at'] < self.negative_ttl):
+                with self._lock:
+                    self.cache_hits += 1
+                return cached['ok']
+
+        with self._lock:
+            self.probed += 1
+        try:
+            response = self.http.head(url, timeout=self.timeout, retries=0, allow_redirects=True)
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+
+        if key:
+            self.cache.set_json(key, {'ok': ok, 'checked_at': time.time()})
+        return ok
+
+    def pick_available(
+        self,
+        candidates: Sequence,
+        count: int,
+        url_of: Callable = lambda animal: animal.image_url
+    ) -> List:
+        """
+        후보를 무작위 순서로 섞은 뒤, 이미지가 접근 가능한 앞쪽 count개를 반환합니다.
+
+        섞은 순서대로 묶음 단위(max_workers * 2)로 동시에 확인하고, 결과도 섞은 순서를 지키므로
+        접근 가능한 후보 중 균등한 무작위 추출과 같습니다. count개를 채우면 남은 후보는 확인하지 않습니다.
+        """
+        order = list(candidates)
+        random.shuffle(order)
+        chunk_size = max(1, self.max_workers * 2)
+
+        picked = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for start in range(0, len(order), chunk_size):
+                chunk = order[start:start + chunk_size]
+                for animal, ok in zip(chunk, executor.map(lambda a: self.is_available(url_of(a)), chunk)):
+                    if ok:
+                        picked.append(animal)
+                        if len(picked) >= count:
+                            return picked
+        return picked
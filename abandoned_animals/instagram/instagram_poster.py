@@ -1,25 +1,118 @@
 """
 Instagram Business API를 사용한 포스팅 (image_url 방식)
 외부 이미지 URL을 받아서 Instagram에 직접 포스팅
+(캐러셀은 아이템 컨테이너를 동시에 만들고 각각 준비될 때까지 함께 기다린 뒤 순서대로 묶어 게시)
 """
-import requests
+import bisect
+import threading
 import time
 import os
-from typing import Dict
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from http_client import RETRY_STATUS_CODES, HttpClient
+
+# 캐러셀 아이템 동시 생성 수 (캐러셀은 최대 10장)
+IG_CHILD_WORKERS = int(os.getenv('IG_CHILD_WORKERS', '10'))
+# 컨테이너 생성 요청 사이 최소 간격 (초, 동시에 몰려 호출 한도에 걸리지 않게)
+IG_CREATE_INTERVAL = float(os.getenv('IG_CREATE_INTERVAL', '0.2'))
+
+# Graph API 호출 한도 초과 오류 코드 (앱/사용자/페이지/비즈니스 사용량)
+RATE_LIMIT_CODES = {4, 17, 32, 613, 80001, 80002}
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 5
+
+# 컨테이너 상태 확인 간격: 짧게 시작해 배수로 늘리되 상한까지만, 전체 대기는 마감 시간까지 (초)
+IG_POLL_INITIAL = float(os.getenv('IG_POLL_INITIAL', '0.5'))
+IG_POLL_MAX = float(os.getenv('IG_POLL_MAX', '8'))
+IG_POLL_FACTOR = 2.0
+IG_POLL_DEADLINE = float(os.getenv('IG_POLL_DEADLINE', '300'))
+# 준비 시간 분포 구간 상한 (초)
+READY_BUCKETS = [1, 2, 5, 10, 30, 60]
+
 
 class InstagramPoster:
-    def __init__(self, page_access_token: str, instagram_business_id: str):
+    def __init__(
+        self,
+        page_access_token: str,
+        instagram_business_id: str,
+        http: Optional[HttpClient] = None,
+        max_workers: int = IG_CHILD_WORKERS,
+        create_interval: float = IG_CREATE_INTERVAL
+    ):
         """
         Instagram Business API 포스터
         
         Args:
             page_access_token: Facebook Page Access Token
             instagram_business_id: Instagram Business Account ID
+            http: 공유할 HTTP 클라이언트 (없으면 keep-alive 클라이언트 생성)
+            max_workers: 캐러셀 아이템 동시 생성 수 (기본: IG_CHILD_WORKERS 또는 10)
+            create_interval: 컨테이너 생성 요청 사이 최소 간격 (기본: IG_CREATE_INTERVAL 또는 0.2초)
         """
         self.page_access_token = page_access_token
         self.instagram_business_id = instagram_business_id
         self.graph_api_version = "v20.0"
         self.base_url = f"https://graph.facebook.com/{self.graph_api_version}"
+        self.max_workers = max(1, max_workers)
+        self.create_interval = create_interval
+        self.http = http or HttpClient(pool_size=self.max_workers, read_timeout=60.0)
+        
+        self._lock = threading.Lock()
+        self._next_create = 0.0
+        self.ready_times = []
+        self.polls = 0
+        self.not_ready = 0
+    
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Graph API 요청 (재시도는 여기서만 하고 HttpClient 자체 재시도는 끔)
+        
+        호출 한도 초과 오류와 연결 전 타임아웃은 요청이 처리되지 않은 것이므로 항상 다시 시도합니다.
+        5xx/429 응답과 응답 대기 중 타임아웃/연결 끊김은 GET(상태 확인)만 다시 시도합니다.
+        컨테이너 생성/게시 POST는 이미 처리됐을 수 있어 다시 보내면 아이템이 중복되거나 두 번 게시됩니다.
+        """
+        idempotent = method.upper() == 'GET'
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            last = attempt >= RATE_LIMIT_RETRIES
+            try:
+                response = self.http.request(method, url, retries=0, **kwargs)
+            except requests.exceptions.ConnectTimeout:
+                if last:
+                    raise
+                wait = self.http._backoff(attempt)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                if last or not idempotent:
+                    raise
+                wait = self.http._backoff(attempt)
+            else:
+                if response.status_code == 200 or last:
+                    return response
+                if response.status_code in RETRY_STATUS_CODES and idempotent:
+                    wait = self.http._backoff(attempt)
+                elif response.status_code >= 500:
+                    return response
+                else:
+                    try:
+                        code = response.json().get('error', {}).get('code')
+                    except ValueError:
+                        return response
+                    if code not in RATE_LIMIT_CODES:
+                        return response
+                    wait = RATE_LIMIT_BACKOFF * (2 ** attempt)
+                    print(f"⏳ Graph API 호출 한도 초과 (코드 {code}), {wait}초 후 다시 시도")
+            
+            self.http.stats.record_retry()
+            time.sleep(wait)
+    
+    def _throttle(self):
+        """컨테이너 생성 요청을 create_interval 간격으로 내보냄"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_create - now
+            self._next_create = max(now, self._next_create) + self.create_interval
+        if wait > 0:
+            time.sleep(wait)
         
     def validate_connection(self) -> Dict:
         """연결 상태 검증"""
@@ -30,7 +123,7 @@ class InstagramPoster:
                 'access_token': self.page_access_token
             }
             
-            response = requests.get(url, params=params)
+            response = self._request('GET', url, params=params)
             
             if response.status_code == 200:
                 account_info = response.json()
@@ -53,17 +146,21 @@ class InstagramPoster:
                 'message': f"연결 검증 중 오류: {e}"
             }
     
-    def create_media_container(self, image_url: str, caption: str) -> Dict:
-        """미디어 컨테이너 생성"""
+    def create_media_container(self, image_url: str, caption: Optional[str] = None, is_carousel_item: bool = False) -> Dict:
+        """미디어 컨테이너 생성 (is_carousel_item이면 캡션 없는 캐러셀 아이템)"""
         try:
             url = f"{self.base_url}/{self.instagram_business_id}/media"
             data = {
                 'image_url': image_url,
-                'caption': caption,
                 'access_token': self.page_access_token
             }
+            if caption is not None:
+                data['caption'] = caption
+            if is_carousel_item:
+                data['is_carousel_item'] = 'true'
             
-            response = requests.post(url, data=data)
+            self._throttle()
+            response = self._request('POST', url, data=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -89,8 +186,20 @@ class InstagramPoster:
                 'message': f"컨테이너 생성 중 오류: {e}"
             }
     
-    def check_container_status(self, container_id: str, max_wait_time: int = 300) -> Dict:
-        """컨테이너 상태 확인 및 대기"""
+    def check_container_status(
+        self,
+        container_id: str,
+        max_wait_time: float = IG_POLL_DEADLINE,
+        initial_interval: float = IG_POLL_INITIAL,
+        max_interval: float = IG_POLL_MAX,
+        verbose: bool = True
+    ) -> Dict:
+        """
+        컨테이너 상태 확인 및 대기
+        
+        initial_interval부터 IG_POLL_FACTOR배씩 늘려 max_interval까지 간격을 두고 확인하고,
+        max_wait_time이 지나면 시간 초과로 끝냅니다. FINISHED까지 걸린 시간은 ready_times에 기록합니다.
+        """
         try:
             url = f"{self.base_url}/{container_id}"
             params = {
@@ -98,43 +207,59 @@ class InstagramPoster:
                 'access_token': self.page_access_token
             }
             
-            start_time = time.time()
+            start_time = time.monotonic()
+            deadline = start_time + max_wait_time
+            interval = initial_interval
             
-            while time.time() - start_time < max_wait_time:
-                response = requests.get(url, params=params)
+            while True:
+                response = self._request('GET', url, params=params)
+                with self._lock:
+                    self.polls += 1
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    status = result.get('status_code')
-                    
-                    print(f"컨테이너 상태: {status}")
-                    
-                    if status == 'FINISHED':
-                        return {
-                            'success': True,
-                            'status': status,
-                            'message': "컨테이너 준비 완료"
-                        }
-                    elif status in ['ERROR', 'EXPIRED']:
-                        return {
-                            'success': False,
-                            'status': status,
-                            'message': f"컨테이너 처리 실패: {status}"
-                        }
-                    elif status == 'IN_PROGRESS':
-                        print("처리 중... 30초 대기")
-                        time.sleep(30)
-                        continue
-                else:
+                if response.status_code != 200:
                     return {
                         'success': False,
                         'error': response.json(),
                         'message': f"상태 확인 실패: {response.status_code}"
                     }
+                
+                status = response.json().get('status_code')
+                elapsed = time.monotonic() - start_time
+                
+                if verbose:
+                    print(f"컨테이너 상태: {status} ({elapsed:.1f}초)")
+                
+                if status == 'FINISHED':
+                    with self._lock:
+                        self.ready_times.append(elapsed)
+                    return {
+                        'success': True,
+                        'status': status,
+                        'elapsed': elapsed,
+                        'message': f"컨테이너 준비 완료 ({elapsed:.1f}초)"
+                    }
+                elif status in ['ERROR', 'EXPIRED']:
+                    with self._lock:
+                        self.not_ready += 1
+                    return {
+                        'success': False,
+                        'status': status,
+                        'message': f"컨테이너 처리 실패: {status}"
+                    }
+                
+                # IN_PROGRESS (상태가 아직 없으면 잠시 후 다시 확인)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(interval, remaining))
+                interval = min(interval * IG_POLL_FACTOR, max_interval)
             
+            with self._lock:
+                self.not_ready += 1
             return {
                 'success': False,
-                'message': f"시간 초과: {max_wait_time}초 내에 처리되지 않음"
+                'status': status,
+                'message': f"시간 초과: {max_wait_time:.0f}초 내에 처리되지 않음"
             }
             
         except Exception as e:
@@ -153,7 +278,7 @@ class InstagramPoster:
                 'access_token': self.page_access_token
             }
             
-            response = requests.post(url, data=data)
+            response = self._request('POST', url, data=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -179,6 +304,149 @@ class InstagramPoster:
                 'message': f"게시 중 오류: {e}"
             }
     
+    def create_carousel_items(self, image_urls: List[str], max_wait_time: float = IG_POLL_DEADLINE) -> List[Optional[str]]:
+        """
+        캐러셀 아이템 컨테이너를 동시에 만들고 각각 FINISHED가 될 때까지 함께 대기
+        
+        Args:
+            image_urls: 공개 이미지 URL 목록 (캐러셀 순서)
+            max_wait_time: 아이템별 최대 대기 시간 (초)
+            
+        Returns:
+            입력 순서대로 컨테이너 ID 목록 (실패한 아이템은 None)
+        """
+        total = len(image_urls)
+        
+        def create_item(index: int, image_url: str) -> Optional[str]:
+            result = self.create_media_container(image_url, is_carousel_item=True)
+            if not result['success']:
+                print(f"   ❌ [{index + 1}/{total}] {result['message']}")
+                return None
+            
+            container_id = result['container_id']
+            status = self.check_container_status(container_id, max_wait_time, verbose=False)
+            if not status['success']:
+                print(f"   ⚠️ [{index + 1}/{total}] {container_id}: {status['message']}")
+                return None
+            
+            print(f"   ✅ [{index + 1}/{total}] ID: {container_id}")
+            return container_id
+        
+        if not image_urls:
+            return []
+        
+        workers = min(self.max_workers, total)
+        print(f"캐러셀 아이템 {total}개 생성 중 (동시 {workers}개)...")
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            item_ids = list(executor.map(create_item, range(total), image_urls))
+        
+        ready = sum(1 for item_id in item_ids if item_id)
+        print(f"   ⏱️ {ready}/{total}개 준비 완료 ({time.time() - start_time:.1f}초)")
+        return item_ids
+    
+    def create_carousel_container(self, children_ids: List[str], caption: str) -> Dict:
+        """캐러셀 컨테이너 생성 (children 순서대로 게시)"""
+        try:
+            url = f"{self.base_url}/{self.instagram_business_id}/media"
+            data = {
+                'media_type': 'CAROUSEL',
+                'children': ','.join(children_ids),
+                'caption': caption,
+                'access_token': self.page_access_token
+            }
+            
+            response = self._request('POST', url, data=data)
+            
+            if response.status_code == 200:
+                container_id = response.json().get('id')
+                return {
+                    'success': True,
+                    'container_id': container_id,
+                    'message': f"캐러셀 컨테이너 생성 성공: {container_id}"
+                }
+            else:
+                error_data = response.json()
+                return {
+                    'success': False,
+                    'error': error_data,
+                    'message': f"캐러셀 생성 실패: {error_data.get('error', {}).get('message', 'Unknown error')}"
+                }
+                
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'message': f"캐러셀 생성 중 오류: {e}"
+            }
+    
+    def post_carousel(self, image_urls: List[str], caption: str) -> Dict:
+        """
+        캐러셀 포스팅 (아이템 동시 생성 → 캐러셀 생성 → 준비 대기 → 게시)
+        
+        Args:
+            image_urls: 공개 이미지 URL 목록 (캐러셀 순서, 2~10장)
+            caption: 포스트 캡션
+            
+        Returns:
+            포스팅 결과
+        """
+        items = self.create_carousel_items(image_urls)
+        item_ids = [item_id for item_id in items if item_id]
+        # 실제로 캐러셀에 들어간 이미지 (만들지 못한 아이템은 빠짐)
+        posted_urls = [url for url, item_id in zip(image_urls, items) if item_id]
+        if len(item_ids) < 2:
+            return {
+                'success': False,
+                'error': f"준비된 아이템 {len(item_ids)}개",
+                'message': "캐러셀에는 최소 2개 이미지가 필요합니다."
+            }
+        
+        print("\n캐러셀 컨테이너 생성 중...")
+        carousel_result = self.create_carousel_container(item_ids, caption)
+        if not carousel_result['success']:
+            return carousel_result
+        
+        carousel_id = carousel_result['container_id']
+        print(f"   ✅ 캐러셀 ID: {carousel_id}")
+        
+        print("\n처리 대기 중...")
+        status_result = self.check_container_status(carousel_id, verbose=False)
+        if not status_result['success']:
+            return status_result
+        
+        print("\n게시 중...")
+        publish_result = self.publish_media(carousel_id)
+        if not publish_result['success']:
+            return publish_result
+        
+        return {
+            'success': True,
+            'media_id': publish_result['media_id'],
+            'container_id': carousel_id,
+            'children': item_ids,
+            'image_urls': posted_urls,
+            'message': publish_result['message']
+        }
+    
+    def print_summary(self):
+        """컨테이너 준비 시간 분포 (FINISHED까지 걸린 시간)"""
+        if not self.ready_times and not self.not_ready:
+            return
+        times = sorted(self.ready_times)
+        print(f"\n⏱️ 컨테이너 준비 시간: {len(times)}개 준비, {self.not_ready}개 실패/시간 초과, 상태 확인 {self.polls}회")
+        if not times:
+            return
+        print(f"   평균 {sum(times) / len(times):.1f}초, p50 {times[len(times) // 2]:.1f}초, 최대 {times[-1]:.1f}초")
+        
+        counts = [0] * (len(READY_BUCKETS) + 1)
+        for t in times:
+            counts[bisect.bisect_left(READY_BUCKETS, t)] += 1
+        labels = [f"~{upper}초" for upper in READY_BUCKETS] + [f"{READY_BUCKETS[-1]}초~"]
+        for label, count in zip(labels, counts):
+            if count:
+                print(f"   {label:>6} {'█' * count} {count}")
+    
     def post_image(self, image_url: str, caption: str) -> Dict:
         """
         완전한 Instagram 포스팅 프로세스
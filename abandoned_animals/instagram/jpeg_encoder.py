@@ -0,0 +1,164 @@
+"""
+업로드용 JPG 인코더
+정해진 품질로 한 번만 인코딩하고, 용량 예산을 넘을 때만 예산에 맞는 품질을 이진 탐색해 줄인 용량을 기록
+(이미 업로드 규격에 맞는 JPG는 다시 인코딩하지 않음)
+"""
+import io
+import os
+import threading
+import time
+from typing import Dict, Optional, Union
+from PIL import Image
+
+# 업로드 이미지 용량 예산 (바이트, 0이면 제한 없음)
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', '0'))
+# 업로드 JPG 품질 (카드 측정 결과 품질 70에서도 원본 대비 SSIM 0.995 이상이라 약간 여유를 둔 75)
+UPLOAD_JPEG_QUALITY = int(os.getenv('UPLOAD_JPEG_QUALITY', '75'))
+# 이 너비보다 크면 줄임 (인스타그램은 1080px로 줄여서 게시, 0이면 줄이지 않음)
+UPLOAD_MAX_WIDTH = int(os.getenv('UPLOAD_MAX_WIDTH', '1080'))
+
+
+class JpegEncoder:
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        quality: Optional[int] = None,
+        max_width: Optional[int] = None,
+        min_quality: int = 50,
+        progressive: bool = True,
+        subsampling: str = '4:2:0'
+    ):
+        """
+        Args:
+            max_bytes: 용량 예산 (기본: UPLOAD_MAX_BYTES, 0이면 제한 없음)
+            quality: JPG 품질 (기본: UPLOAD_JPEG_QUALITY)
+            max_width: 이 너비보다 크면 비율 유지해 줄임 (기본: UPLOAD_MAX_WIDTH, 0이면 그대로)
+            min_quality: 용량 예산에 맞출 때 내려갈 최저 품질
+            progressive: 프로그레시브 JPG로 저장
+            subsampling: 색차 서브샘플링 ('4:4:4', '4:2:2', '4:2:0')
+        """
+        self.max_bytes = UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+        self.quality = quality or UPLOAD_JPEG_QUALITY
+        self.max_width = UPLOAD_MAX_WIDTH if max_width is None else max_width
+        self.min_quality = min(min_quality, self.quality)
+        self.progressive = progressive
+        self.subsampling = subsampling
+
+        self._lock = threading.Lock()
+        self.encoded = 0
+        self.passed = 0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.qualities = []
+        self.encode_times = []
+        self.over_budget = 0
+
+    def options(self) -> Dict:
+        """결과에 영향을 주는 설정 (렌더 캐시 키에 포함)"""
+        return {
+            'max_bytes': self.max_bytes,
+            'quality': self.quality,
+            'max_width': self.max_width,
+            'min_quality': self.min_quality,
+            'progressive': self.progressive,
+            'subsampling': self.subsampling,
+        }
+
+    def _fits(self, data: Union[bytes, Image.Image]) -> bool:
+        """
+        이미 업로드 규격(JPG, 최대 너비, 용량 예산)에 맞는지
+
+        렌더러가 이 인코더의 품질로 바로 JPG를 만든 경우 (카드 생성기) 다시 인코딩하지 않습니다.
+        """
+        if not isinstance(data, (bytes, bytearray)) or not data.startswith(b'\xff\xd8'):
+            return False
+        if self.max_bytes and len(data) > self.max_bytes:
+            return False
+        if self.max_width:
+            with Image.open(io.BytesIO(data)) as image:
+                return image.width <= self.max_width
+        return True
+
+    def _prepare(self, image: Image.Image) -> Image.Image:
+        """RGB로 변환하고 (투명 영역은 흰색) 최대 너비에 맞게 줄이기"""
+        if image.mode in ('RGBA', 'LA'):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.split()[-1])
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        return image
+
+    def _save(self, image: Image.Image, quality: int) -> bytes:
+        buffer = io.BytesIO()
+        image.save(
+            buffer, 'JPEG', quality=quality, optimize=True,
+            progressive=self.progressive, subsampling=self.subsampling
+        )
+        return buffer.getvalue()
+
+    def encode(self, data: Union[bytes, Image.Image]) -> bytes:
+        """
+        업로드용 JPG bytes 생성
+
+        1. 이미 규격에 맞는 JPG면 그대로 쓰고
+        2. 아니면 정해진 품질로 한 번 인코딩하고
+        3. 그래도 용량 예산을 넘으면 예산에 들어가는 가장 높은 품질로 낮춥니다 (min_quality까지).
+        """
+        start = time.perf_counter()
+        input_size = len(data) if isinstance(data, (bytes, bytearray)) else None
+
+        if self._fits(data):
+            with self._lock:
+                self.passed += 1
+                self.input_bytes += input_size
+                self.output_bytes += input_size
+            return bytes(data)
+
+        image = Image.open(io.BytesIO(data)) if isinstance(data, (bytes, bytearray)) else data
+        image = self._prepare(image)
+
+        quality = self.quality
+        result = self._save(image, quality)
+
+        # 용량 예산을 넘으면 예산 안에서 가장 높은 품질 (품질이 낮을수록 작음)
+        if self.max_bytes and len(result) > self.max_bytes:
+            encodings = {quality: result}
+            low, high = self.min_quality, quality - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                encodings[middle] = self._save(image, middle)
+                if len(encodings[middle]) <= self.max_bytes:
+                    low = middle
+                else:
+                    high = middle - 1
+            quality = low
+            result = encodings.get(quality) or self._save(image, quality)
+            if len(result) > self.max_bytes:
+                print(f"⚠️ 품질 {quality}에서도 예산 {self.max_bytes / 1024:.0f}KB를 넘습니다 ({len(result) / 1024:.0f}KB)")
+                with self._lock:
+                    self.over_budget += 1
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.encoded += 1
+            self.input_bytes += input_size or 0
+            self.output_bytes += len(result)
+            self.qualities.append(quality)
+            self.encode_times.append(elapsed)
+        return result
+
+    def print_summary(self):
+        if not self.encoded and not self.passed:
+            return
+        saved = self.input_bytes - self.output_bytes
+        ratio = saved / self.input_bytes * 100 if self.input_bytes else 0
+        print(f"🗜️ JPG 최적화: 그대로 사용 {self.passed}장, 다시 인코딩 {self.encoded}장, "
+              f"{self.input_bytes / 1024:.0f}KB → {self.output_bytes / 1024:.0f}KB ({saved / 1024:.0f}KB, {ratio:.0f}% 절약)")
+        if self.encoded:
+            print(f"   평균 품질 {sum(self.qualities) / len(self.qualities):.0f}, "
+                  f"평균 {sum(self.encode_times) / len(self.encode_times) * 1000:.0f}ms, 예산 초과 {self.over_budget}장")
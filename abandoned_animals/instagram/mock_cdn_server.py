@@ -0,0 +1,131 @@
+"""
+로컬 FindYou CDN 대역 서버 (업로드 테스트용)
+실제 CDN처럼 multipart `files` 필드 여러 개를 받아 {'success': True, 'data': {'urls': [...]}}로 응답하고,
+올린 파일은 메모리에 보관해 GET/HEAD로 내려줌
+
+사용법:
+    python mock_cdn_server.py --port 8766 --token test [--latency 0.2] [--fail-rate 0.1]
+    FINDYOU_CDN_URL=http://127.0.0.1:8766/upload FINDYOU_CDN_TOKEN=test python run_post.py 2026-01-13 --post
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+
+def parse_files(content_type: str, body: bytes, field: str = 'files') -> List[Tuple[str, bytes]]:
+    """multipart/form-data 본문에서 field 이름의 파일들 [(파일명, bytes), ...]"""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + body
+    )
+    files = []
+    for part in message.iter_parts():
+        if part.get_param('name', header='content-disposition') == field and part.get_filename():
+            files.append((part.get_filename(), part.get_payload(decode=True)))
+    return files
+
+
+class MockCdnServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], token: str, latency: float = 0.0, fail_rate: float = 0.0):
+        super().__init__(address, MockCdnHandler)
+        self.token = token
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.files: Dict[str, bytes] = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.uploaded = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class MockCdnHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        with server.lock:
+            server.requests += 1
+
+        if self.headers.get('Authorization') != f"Bearer {server.token}":
+            self._send_json(401, {'success': False, 'message': 'unauthorized'})
+            return
+        if server.latency:
+            time.sleep(server.latency)
+        if random.random() < server.fail_rate:
+            self._send_json(503, {'success': False, 'message': 'temporarily unavailable'})
+            return
+
+        files = parse_files(self.headers.get('Content-Type', ''), body)
+        if not files:
+            self._send_json(400, {'success': False, 'message': 'no files'})
+            return
+
+        urls = []
+        with server.lock:
+            for filename, data in files:
+                server.files[filename] = data
+                server.uploaded += 1
+                urls.append(f"{server.base_url}/files/{filename}")
+        self._send_json(200, {'success': True, 'data': {'urls': urls}})
+
+    def do_GET(self, head: bool = False):
+        filename = self.path.rsplit('/', 1)[-1]
+        data = self.server.files.get(filename) if self.path.startswith('/files/') else None
+        if data is None:
+            self._send_json(404, {'success': False, 'message': 'not found'})
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 FindYou CDN 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소 (기본: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8766, help='포트 (기본: 8766)')
+    parser.add_argument('--token', default='test', help='허용할 Bearer 토큰 (기본: test)')
+    parser.add_argument('--latency', type=float, default=0.0, help='요청마다 더할 지연 (초)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='503으로 실패시킬 비율 (0~1)')
+    args = parser.parse_args()
+
+    server = MockCdnServer((args.host, args.port), args.token, args.latency, args.fail_rate)
+    print(f"🗄️ CDN 대역 서버 시작: {server.base_url}/upload (토큰 {args.token})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"👋 CDN 대역 서버 종료 (요청 {server.requests}회, 파일 {server.uploaded}개)")
+
+
+if __name__ == "__main__":
+    main()
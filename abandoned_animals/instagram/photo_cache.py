@@ -0,0 +1,161 @@
+"""
+보호소 사진 미리 받기 + 디스크 LRU 캐시
+카드 사진 칸(532x528 x 배율) 크기로 줄여 보관하고, 렌더링할 때는 data URI로 바로 넣음
+"""
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from PIL import Image
+from disk_cache import DiskCache
+from http_client import HttpClient
+
+PHOTO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache', 'photos')
+# 같은 공고 사진은 바뀌지 않으므로 길게 보관 (기본 7일)
+PHOTO_CACHE_TTL = int(os.getenv('PHOTO_CACHE_TTL', str(7 * 24 * 60 * 60)))
+PHOTO_CACHE_MAX_BYTES = 300 * 1024 * 1024
+
+# 카드 사진 칸 크기 (CSS px)
+PHOTO_SLOT = (532, 528)
+
+
+def photo_data_uri(data: bytes) -> str:
+    """사진 bytes를 <img src>에 바로 넣을 수 있는 data URI로 변환"""
+    mime = 'image/png' if data[:8] == b'\x89PNG\r\n\x1a\n' else 'image/jpeg'
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def photo_file_uri(data: bytes, directory: str) -> str:
+    """
+    사진 bytes를 directory에 내용 해시 이름으로 저장하고 file:// URI 반환
+
+    배치 페이지에 사진 여러 장을 data URI로 넣으면 HTML이 수 MB로 커지므로,
+    file://로 불러오는 페이지(RenderSession.load)에서는 사진을 파일로 참조합니다.
+    """
+    ext = '.png' if data[:8] == b'\x89PNG\r\n\x1a\n' else '.jpg'
+    path = os.path.join(directory, f"photo_{hashlib.sha256(data).hexdigest()[:16]}{ext}")
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+    return Path(path).as_uri()
+
+
+class PhotoCache:
+    def __init__(
+        self,
+        cache: Optional[DiskCache] = None,
+        http: Optional[HttpClient] = None,
+        slot: Tuple[int, int] = PHOTO_SLOT,
+        scale: int = 2,
+        max_workers: int = 8,
+        timeout: float = 10.0,
+        quality: int = 90
+    ):
+        """
+        Args:
+            cache: 줄인 사진을 보관할 디스크 캐시 (기본: data/cache/photos, 7일, 300MB)
+            http: 사진 다운로드용 HTTP 클라이언트 (없으면 직접 생성)
+            slot: 사진 칸 크기 (CSS px)
+            scale: 렌더링 배율 (줄이는 크기 = slot x scale)
+            max_workers: 동시에 내려받을 사진 수
+            timeout: 사진 다운로드 타임아웃 (초)
+            quality: 줄인 사진의 JPG 품질
+        """
+        self.cache = cache if cache is not None else DiskCache(PHOTO_CACHE_DIR, ttl=PHOTO_CACHE_TTL, max_bytes=PHOTO_CACHE_MAX_BYTES)
+        self._http = http
+        self._owns_http = http is None
+        self.size = (slot[0] * scale, slot[1] * scale)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.quality = quality
+        # 이번 실행에서 읽은 사진 (url → bytes, 실패는 None)
+        self._memo: Dict[str, Optional[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.downloaded = 0
+        self.failed = 0
+        self.original_bytes = 0
+        self.stored_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def http(self) -> HttpClient:
+        if self._http is None:
+            self._http = HttpClient(pool_size=self.max_workers, read_timeout=self.timeout)
+        return self._http
+
+    def close(self):
+        if self._owns_http and self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def _key(self, url: str) -> str:
+        return DiskCache.make_key('photo', {'url': url, 'width': self.size[0], 'height': self.size[1]})
+
+    def _downsize(self, raw: bytes) -> bytes:
+        """사진 칸 크기에 맞게 줄이기 (비율 유지, 확대하지 않음)"""
+        with Image.open(io.BytesIO(raw)) as photo:
+            photo.thumbnail(self.size, Image.LANCZOS)
+            buffer = io.BytesIO()
+            has_alpha = photo.mode in ('RGBA', 'LA') or (photo.mode == 'P' and 'transparency' in photo.info)
+            if has_alpha:
+                photo.save(buffer, 'PNG', optimize=True)
+            else:
+                photo.convert('RGB').save(buffer, 'JPEG', quality=self.quality, optimize=True)
+            return buffer.getvalue()
+
+    def get(self, url: Optional[str]) -> Optional[bytes]:
+        """줄인 사진 bytes (캐시 우선, 실패하면 None)"""
+        if not url:
+            return None
+        if url in self._memo:
+            return self._memo[url]
+
+        key = self._key(url)
+        data = self.cache.get(key)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+        else:
+            try:
+                response = self.http.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                data = self._downsize(response.content)
+                self.cache.set(key, data)
+                with self._lock:
+                    self.downloaded += 1
+                    self.original_bytes += len(response.content)
+                    self.stored_bytes += len(data)
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                print(f"⚠️ 사진 다운로드 실패: {url} - {e}")
+                data = None
+
+        self._memo[url] = data
+        return data
+
+    def prefetch(self, urls: Iterable[Optional[str]]) -> Dict[str, Optional[bytes]]:
+        """여러 사진을 동시에 미리 받아 캐시"""
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if not unique:
+            return {}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            photos = dict(zip(unique, executor.map(self.get, unique)))
+
+        print(f"🖼️ 사진 미리 받기: {len(unique)}장 ({time.perf_counter() - start:.1f}초, "
+              f"캐시 {self.hits} / 다운로드 {self.downloaded} / 실패 {self.failed}, "
+              f"{self.original_bytes / 1024:.0f}KB → {self.stored_bytes / 1024:.0f}KB)")
+        return photos
@@ -0,0 +1,288 @@
+"""
+브라우저 없이 Pillow로 인스타그램 카드 그리기
+card_spec의 명세(좌표/폰트 크기/문구)를 HTML 렌더러와 같은 배치로 직접 그림
+"""
+import io
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageFont
+from card_spec import (
+    BREED_BOTTOM, BREED_FONT_SIZE, LABEL_FONT_SIZE, LABEL_LEFT, LINE_HEIGHT,
+    PHOTO_HEIGHT, PHOTO_OFFSET, POLAROID_BG, POLAROID_ROTATION, POLAROID_TOP,
+    TEXT_COLOR, TITLE_FONT_SIZE, TITLE_LINE_HEIGHT, TITLE_TOP, VALUE_LEFT,
+    CardRow, CardSpec
+)
+from assets import font_path, resolve_offline, system_font_path
+from http_client import HttpClient
+
+# box-shadow: 10px 10px 4px rgba(0, 0, 0, 0.25)
+SHADOW_OFFSET = 10
+SHADOW_BLUR = 4
+SHADOW_ALPHA = 64
+# 그림자가 잘리지 않도록 프레임 레이어에 두는 여백
+FRAME_PADDING = 24
+
+_SPACES = re.compile(r'[ \t]+')
+
+
+class PillowRenderer:
+    def __init__(
+        self,
+        width: int = 1080,
+        height: int = 1500,
+        scale: int = 2,
+        http: Optional[HttpClient] = None,
+        photo_timeout: Optional[float] = None,
+        offline: Optional[bool] = None
+    ):
+        """
+        Args:
+            width: 캔버스 너비 (CSS px)
+            height: 캔버스 높이 (CSS px)
+            scale: 배율 (2면 Chrome 렌더러와 같은 2160x3000)
+            http: 사진 다운로드용 HTTP 클라이언트 (없으면 직접 생성)
+            photo_timeout: 사진 다운로드 제한 시간 (초, 기본: RENDER_READY_TIMEOUT 또는 10)
+            offline: True면 번들에 없는 폰트를 내려받지 않음 (기본: RENDER_OFFLINE)
+        """
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.photo_timeout = photo_timeout if photo_timeout is not None else float(os.getenv('RENDER_READY_TIMEOUT', '10'))
+        self.offline = resolve_offline(offline)
+        self._http = http
+        self._owns_http = http is None
+        self._fonts: Dict[Tuple[str, int], ImageFont.FreeTypeFont] = {}
+        self._font_paths: Dict[str, Optional[str]] = {}
+        self.rendered = 0
+        self.render_times = []
+        self.photo_failures = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def http(self) -> HttpClient:
+        if self._http is None:
+            self._http = HttpClient(pool_size=4, read_timeout=self.photo_timeout)
+        return self._http
+
+    def close(self):
+        if self._owns_http and self._http is not None:
+            self._http.close()
+            self._http = None
+
+    # ------------------------------------------------------------------
+    # 폰트
+    # ------------------------------------------------------------------
+    def _font_path(self, family: str) -> Optional[str]:
+        """번들 폰트 경로 (없으면 시스템 한글 폰트)"""
+        path = font_path(family, self.offline, self.http)
+        if path:
+            return path
+
+        fallback = system_font_path()
+        if fallback:
+            print(f"⚠️ {family} 대신 {fallback} 사용")
+        return fallback
+
+    def font(self, family: str, size: float) -> ImageFont.FreeTypeFont:
+        """배율을 적용한 폰트 (패밀리/크기별로 한 번만 로드)"""
+        pixel_size = round(size * self.scale)
+        key = (family, pixel_size)
+        if key not in self._fonts:
+            if family not in self._font_paths:
+                self._font_paths[family] = self._font_path(family)
+            path = self._font_paths[family]
+            self._fonts[key] = ImageFont.truetype(path, pixel_size) if path else ImageFont.load_default(pixel_size)
+        return self._fonts[key]
+
+    # ------------------------------------------------------------------
+    # 그리기
+    # ------------------------------------------------------------------
+    def _px(self, value: float) -> int:
+        return round(value * self.scale)
+
+    def _gradient(self, top_color: str, bottom_color: str) -> Image.Image:
+        """위→아래 선형 그라데이션 배경"""
+        size = (self._px(self.width), self._px(self.height))
+        mask = Image.linear_gradient('L').resize(size, Image.BILINEAR)
+        top = Image.new('RGBA', size, ImageColor.getrgb(top_color))
+        bottom = Image.new('RGBA', size, ImageColor.getrgb(bottom_color))
+        return Image.composite(bottom, top, mask)
+
+    def _baseline(self, font: ImageFont.FreeTypeFont, line_top: float, line_height: float) -> float:
+        """CSS line-height처럼 줄 상자 안에서 글자를 세로 가운데 정렬한 기준선 위치 (px)"""
+        ascent, descent = font.getmetrics()
+        return self._px(line_top) + (self._px(line_height) - (ascent + descent)) / 2 + ascent
+
+    def _draw_lines(
+        self,
+        draw: ImageDraw.ImageDraw,
+        lines: List[str],
+        font: ImageFont.FreeTypeFont,
+        left: float,
+        top: float,
+        line_height: float,
+        width: Optional[float] = None,
+        fill=TEXT_COLOR
+    ):
+        """줄 목록을 line_height 간격으로 그리기 (width가 있으면 가운데 정렬)"""
+        for i, line in enumerate(lines):
+            x = self._px(left)
+            if width is not None:
+                x += (self._px(width) - font.getlength(line)) / 2
+            draw.text((x, self._baseline(font, top + i * line_height, line_height)), line, font=font, fill=fill, anchor='ls')
+
+    def _wrap_chars(self, text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+        """white-space: pre-line + word-break: break-all 줄바꿈 (글자 단위)"""
+        limit = self._px(max_width)
+        lines = []
+        for paragraph in text.split('\n'):
+            paragraph = _SPACES.sub(' ', paragraph).strip()
+            line = ''
+            for char in paragraph:
+                if line and font.getlength(line + char) > limit:
+                    lines.append(line.rstrip())
+                    line = char.lstrip()
+                else:
+                    line += char
+            lines.append(line)
+        return lines
+
+    def _wrap_words(self, text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+        """공백 기준 줄바꿈, 한 단어가 너비를 넘으면 글자 단위로 나눔"""
+        limit = self._px(max_width)
+        lines = []
+        line = ''
+        for word in text.split():
+            candidate = f"{line} {word}" if line else word
+            if font.getlength(candidate) <= limit:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            line = ''
+            for char in word:
+                if line and font.getlength(line + char) > limit:
+                    lines.append(line)
+                    line = char
+                else:
+                    line += char
+        if line:
+            lines.append(line)
+        return lines or ['']
+
+    def _draw_row(self, canvas: Image.Image, row: CardRow):
+        draw = ImageDraw.Draw(canvas)
+        self._draw_lines(draw, [row.label], self.font('Jua', LABEL_FONT_SIZE), LABEL_LEFT, row.top, LINE_HEIGHT)
+
+        value_font = self.font('BMHANNAAir', row.font_size)
+        if not row.multiline:
+            self._draw_lines(draw, [row.value], value_font, VALUE_LEFT, row.top, row.line_height)
+            return
+
+        # overflow: hidden → 별도 레이어에 그린 뒤 max_height에서 잘라 붙임
+        lines = self._wrap_chars(row.value, value_font, row.width or self.width - VALUE_LEFT)
+        box_height = row.max_height or len(lines) * row.line_height
+        box = Image.new('RGBA', (self._px(row.width or self.width - VALUE_LEFT), self._px(box_height)), (0, 0, 0, 0))
+        self._draw_lines(ImageDraw.Draw(box), lines, value_font, 0, 0, row.line_height)
+        canvas.alpha_composite(box, (self._px(VALUE_LEFT), self._px(row.top)))
+
+    def fetch_photo(self, url: Optional[str]) -> Optional[Image.Image]:
+        """동물 사진 다운로드 (실패하면 None → HTML의 onerror처럼 사진 없이 그림)"""
+        if not url:
+            return None
+        try:
+            response = self.http.get(url, timeout=self.photo_timeout, retries=0)
+            response.raise_for_status()
+            photo = Image.open(io.BytesIO(response.content))
+            photo.load()
+            return photo.convert('RGBA')
+        except Exception as e:
+            self.photo_failures += 1
+            print(f"⚠️ 사진을 불러오지 못해 빈 프레임으로 그립니다: {e}")
+            return None
+
+    def _draw_polaroid(self, canvas: Image.Image, card: CardSpec):
+        """그림자 + 폴라로이드 배경 + 사진 + 품종명을 한 레이어에 그린 뒤 회전해서 붙이기"""
+        frame_width, frame_height = card.polaroid_size
+        pad = FRAME_PADDING
+        layer_size = (self._px(frame_width + pad * 2), self._px(frame_height + pad * 2))
+        frame_box = [self._px(pad), self._px(pad), self._px(pad + frame_width), self._px(pad + frame_height)]
+
+        # box-shadow (프레임과 함께 회전)
+        shadow_mask = Image.new('L', layer_size, 0)
+        offset = self._px(SHADOW_OFFSET)
+        ImageDraw.Draw(shadow_mask).rectangle(
+            [frame_box[0] + offset, frame_box[1] + offset, frame_box[2] + offset, frame_box[3] + offset],
+            fill=SHADOW_ALPHA
+        )
+        shadow_mask = shadow_mask.filter(ImageFilter.GaussianBlur(self._px(SHADOW_BLUR) / 2))
+        layer = Image.new('RGBA', layer_size, (0, 0, 0, 0))
+        layer.putalpha(shadow_mask)
+
+        draw = ImageDraw.Draw(layer)
+        draw.rectangle([frame_box[0], frame_box[1], frame_box[2] - 1, frame_box[3] - 1], fill=POLAROID_BG)
+
+        # object-fit: contain (미리 받은 사진이 있으면 다운로드 생략)
+        photo = Image.open(io.BytesIO(card.photo)).convert('RGBA') if card.photo else self.fetch_photo(card.image_url)
+        if photo is not None:
+            box_width, box_height = self._px(card.photo_width), self._px(PHOTO_HEIGHT)
+            ratio = min(box_width / photo.width, box_height / photo.height)
+            fitted = photo.resize((max(1, round(photo.width * ratio)), max(1, round(photo.height * ratio))), Image.LANCZOS)
+            x = self._px(pad + PHOTO_OFFSET[0]) + (box_width - fitted.width) // 2
+            y = self._px(pad + PHOTO_OFFSET[1]) + (box_height - fitted.height) // 2
+            layer.alpha_composite(fitted, (x, y))
+
+        self._draw_breed(layer, card, pad)
+
+        rotated = layer.rotate(-POLAROID_ROTATION, resample=Image.BICUBIC, expand=True)
+        center_x = self._px(card.polaroid_left + frame_width / 2)
+        center_y = self._px(POLAROID_TOP + frame_height / 2)
+        canvas.paste(rotated, (center_x - rotated.width // 2, center_y - rotated.height // 2), rotated)
+
+    def _draw_breed(self, layer: Image.Image, card: CardSpec, pad: float):
+        """프레임 하단 가운데 품종명 (text-shadow: 1px 1px 2px rgba(255,255,255,0.8))"""
+        frame_width, frame_height = card.polaroid_size
+        font = self.font('Jua', BREED_FONT_SIZE)
+        ascent, descent = font.getmetrics()
+        line_height = (ascent + descent) / self.scale
+
+        # left: 50% → 쓸 수 있는 너비는 프레임 절반
+        lines = self._wrap_words(card.breed, font, frame_width / 2)
+        text_width = max(font.getlength(line) for line in lines) / self.scale
+        left = pad + (frame_width - text_width) / 2
+        top = pad + frame_height - BREED_BOTTOM - line_height * len(lines)
+
+        glow = Image.new('RGBA', layer.size, (0, 0, 0, 0))
+        self._draw_lines(ImageDraw.Draw(glow), lines, font, left + 1, top + 1, line_height, text_width, fill=(255, 255, 255, 204))
+        layer.alpha_composite(glow.filter(ImageFilter.GaussianBlur(self._px(1))))
+        self._draw_lines(ImageDraw.Draw(layer), lines, font, left, top, line_height, text_width)
+
+    def render(self, card: CardSpec) -> Image.Image:
+        """카드 명세를 RGB 이미지로 그리기"""
+        start = time.perf_counter()
+
+        canvas = self._gradient(*card.background)
+        self._draw_polaroid(canvas, card)
+
+        draw = ImageDraw.Draw(canvas)
+        self._draw_lines(draw, [card.title], self.font('Jua', TITLE_FONT_SIZE), 0, TITLE_TOP, TITLE_LINE_HEIGHT, self.width)
+        for row in card.rows:
+            self._draw_row(canvas, row)
+
+        self.render_times.append(time.perf_counter() - start)
+        self.rendered += 1
+        return canvas.convert('RGB')
+
+    def print_wait_summary(self):
+        if not self.render_times:
+            return
+        times = sorted(self.render_times)
+        print(f"⏱️ Pillow 렌더링: {len(times)}장, 평균 {sum(times) / len(times) * 1000:.0f}ms, "
+              f"최대 {times[-1] * 1000:.0f}ms, 사진 실패 {self.photo_failures}장")
@@ -0,0 +1,122 @@
+"""
+포스팅한 실종동물 ID 기록 (append-only 원장)
+한 줄에 하나씩 'ID<TAB>실종일(YYYYMMDD)<TAB>포스팅 시각'을 추가만 하고,
+조회 기간에서 벗어난 오래된 ID는 compact()로 정리
+"""
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+# ID에서 실종일 추출 (예: loss/2026/01/20260127184213104.jpg → 20260127)
+_DATE_IN_ID = re.compile(r'(20\d{6})')
+
+
+def loss_date_from_id(animal_id: str) -> str:
+    """ID에 포함된 날짜(YYYYMMDD)를 추출, 없으면 빈 문자열"""
+    filename = animal_id.rsplit('/', 1)[-1]
+    match = _DATE_IN_ID.search(filename.replace('-', ''))
+    return match.group(1) if match else ''
+
+
+class PostedLedger:
+    def __init__(self, path: str, legacy_json_path: Optional[str] = None):
+        """
+        Args:
+            path: 원장 파일 경로 (.tsv)
+            legacy_json_path: 기존 posted_lost_animals.json 경로 (원장이 없으면 가져옴)
+        """
+        self.path = path
+        self._entries: Dict[str, str] = {}
+
+        if os.path.exists(path):
+            self._load()
+        elif legacy_json_path and os.path.exists(legacy_json_path):
+            imported = self.import_json(legacy_json_path)
+            print(f"📥 기존 포스팅 기록 {imported}건을 원장으로 가져왔습니다.")
+
+    def __contains__(self, animal_id: str) -> bool:
+        return animal_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if parts[0]:
+                    self._entries[parts[0]] = parts[1] if len(parts) > 1 else ''
+
+    def add(self, posted: Iterable[Tuple[str, str]]) -> int:
+        """
+        포스팅한 동물을 원장 끝에 추가합니다.
+
+        Args:
+            posted: (동물 ID, 실종일 YYYYMMDD) 목록
+
+        Returns:
+            새로 추가된 ID 수
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        lines = []
+        for animal_id, loss_date in posted:
+            if not animal_id or animal_id in self._entries:
+                continue
+            loss_date = loss_date or loss_date_from_id(animal_id)
+            self._entries[animal_id] = loss_date
+            lines.append(f"{animal_id}\t{loss_date}\t{now}\n")
+
+        if lines:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+        return len(lines)
+
+    def compact(self, min_loss_date: str) -> int:
+        """
+        실종일이 min_loss_date(YYYYMMDD)보다 이전인 ID를 정리합니다.
+
+        조회 기간 밖의 동물은 다시 후보가 되지 않으므로 기록할 필요가 없습니다.
+        실종일을 알 수 없는 ID는 유지합니다.
+
+        Returns:
+            삭제된 ID 수
+        """
+        expired = [
+            animal_id for animal_id, loss_date in self._entries.items()
+            if loss_date and loss_date < min_loss_date
+        ]
+        if not expired:
+            return 0
+
+        for animal_id in expired:
+            del self._entries[animal_id]
+
+        # 남은 줄만 원래 순서대로 다시 쓰기 (임시 파일 → 교체)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            kept = [line for line in f if line.split('\t', 1)[0].rstrip('\n') in self._entries]
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(kept)
+        os.replace(tmp_path, self.path)
+        return len(expired)
+
+    def import_json(self, json_path: str) -> int:
+        """
+        기존 {'posted_ids': [...]} JSON 기록을 가져옵니다.
+
+        손상된 JSON(예: 끝의 쉼표)이어도 posted_ids 목록의 문자열은 최대한 읽습니다.
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+
+        try:
+            ids = json.loads(raw).get('posted_ids', [])
+        except ValueError:
+            block = re.search(r'"posted_ids"\s*:\s*\[(.*?)\]', raw, re.S)
+            ids = re.findall(r'"((?:[^"\\]|\\.)*)"', block.group(1)) if block else []
+
+        return self.add((animal_id, loss_date_from_id(animal_id)) for animal_id in ids)
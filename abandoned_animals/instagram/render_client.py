@@ -0,0 +1,91 @@
+"""
+로컬 렌더 서버(render_server.py) 클라이언트
+RENDER_SERVER_URL이 있으면 카드를 서버에 보내 띄워둔 렌더러로 렌더링
+"""
+import base64
+import os
+from typing import Dict, List, Optional
+from card_spec import TEMPLATE_VERSION, CardSpec
+from http_client import HttpClient
+
+
+class RenderClient:
+    def __init__(self, url: str, http: Optional[HttpClient] = None, timeout: float = 300.0):
+        """
+        Args:
+            url: 렌더 서버 주소 (예: http://127.0.0.1:8765)
+            http: HTTP 클라이언트 (없으면 직접 생성)
+            timeout: 렌더링 요청 응답 대기 시간 (초)
+        """
+        self.url = url.rstrip('/')
+        self._http = http
+        self.timeout = timeout
+        self._available: Optional[bool] = None
+
+    @classmethod
+    def from_env(cls) -> Optional['RenderClient']:
+        """RENDER_SERVER_URL이 설정된 경우에만 클라이언트 생성"""
+        url = os.getenv('RENDER_SERVER_URL')
+        return cls(url) if url else None
+
+    @property
+    def http(self) -> HttpClient:
+        if self._http is None:
+            self._http = HttpClient(pool_size=2, connect_timeout=2.0, read_timeout=self.timeout)
+        return self._http
+
+    def available(self) -> bool:
+        """서버가 떠 있고 같은 템플릿 버전인지 (한 번만 확인)"""
+        if self._available is None:
+            try:
+                response = self.http.get(f"{self.url}/health", retries=0, timeout=2.0)
+                health = response.json() if response.ok else {}
+                self._available = health.get('template') == TEMPLATE_VERSION
+                if not self._available:
+                    print(f"⚠️ 렌더 서버를 사용할 수 없습니다 (HTTP {response.status_code}, 템플릿 {health.get('template')})")
+            except Exception as e:
+                print(f"⚠️ 렌더 서버에 연결할 수 없습니다: {e}")
+                self._available = False
+        return self._available
+
+    def render_cards(
+        self,
+        cards: List[CardSpec],
+        options: Dict,
+        batch_size: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        카드 렌더링 요청
+
+        Args:
+            options: 렌더 옵션 (CardImageGenerator.render_options())
+
+        Returns:
+            입력 순서대로 [{'success': True, 'data': JPG bytes} 또는 {'success': False, 'error'}]
+            (서버 오류는 예외)
+        """
+        response = self.http.post(f"{self.url}/render", json={
+            'template': TEMPLATE_VERSION,
+            'options': options,
+            'batch_size': batch_size,
+            'cards': [card.to_dict() for card in cards],
+        }, retries=0)
+        if not response.ok:
+            raise Exception(f"렌더 서버 오류 (HTTP {response.status_code}): {response.text[:200]}")
+
+        results = response.json()['results']
+        if len(results) != len(cards):
+            raise Exception(f"렌더 서버 응답 개수 불일치 ({len(results)}/{len(cards)})")
+        return [
+            {
+                'data': base64.b64decode(result['data']),
+                'complete': result.get('complete', True),
+                'success': True,
+            } if result['success'] else result
+            for result in results
+        ]
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+            self._http = None
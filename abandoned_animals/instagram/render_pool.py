@@ -0,0 +1,115 @@
+"""
+카드 렌더 워커 풀
+워커 프로세스마다 렌더링 세션(Chrome 또는 Pillow)을 하나씩 띄워두고 카드 묶음을 나눠 렌더링
+결과는 입력 순서대로 모으고, 워커 하나가 죽어도 그 묶음만 현재 프로세스에서 다시 렌더링
+"""
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+from typing import Dict, List, Optional
+from card_spec import CardSpec
+
+# 워커 프로세스 안에서 재사용할 생성기/세션
+_worker_generator = None
+_worker_session = None
+
+
+def _init_worker(generator_class, options: Dict):
+    """워커 시작 시 한 번: 같은 렌더 옵션으로 생성기와 렌더링 세션 준비 (프로세스 종료 시 세션 정리)"""
+    global _worker_generator, _worker_session
+    _worker_generator = generator_class(**options)
+    _worker_session = _worker_generator.session()
+    Finalize(None, _worker_session.close, exitpriority=10)
+
+
+def _render_chunk(cards: List[CardSpec], batch_size: Optional[int]) -> List[Dict]:
+    return _worker_generator.render_cards(cards, _worker_session, batch_size)
+
+
+class RenderPool:
+    def __init__(self, generator, workers: int = 2):
+        """
+        Args:
+            generator: 렌더 옵션을 가져올 CardImageGenerator
+            workers: 워커 프로세스 수
+        """
+        self.generator = generator
+        self.workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """처음 사용할 때 워커 시작 (spawn: 부모의 스레드/브라우저 상태를 물려받지 않음)"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(type(self.generator), self.generator.render_options()),
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _chunk_size(self, count: int, batch_size: Optional[int]) -> int:
+        """워커가 고르게 일하도록 나누되, Chrome은 배치 크기를 넘지 않게"""
+        if self.generator.renderer == 'pillow':
+            return 1
+        size = math.ceil(count / self.workers)
+        return max(1, min(size, batch_size) if batch_size else size)
+
+    def render(self, cards: List[CardSpec], batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        카드 목록을 워커에 나눠 렌더링
+
+        Returns:
+            입력 순서대로 [{'success': True, 'data': JPG bytes} 또는 {'success': False, 'error'}]
+        """
+        if not cards:
+            return []
+
+        start = time.perf_counter()
+        size = self._chunk_size(len(cards), batch_size)
+        chunks = [cards[i:i + size] for i in range(0, len(cards), size)]
+        results: List[Optional[List[Dict]]] = [None] * len(chunks)
+        failed = []
+
+        print(f"🧵 렌더 워커 {self.workers}개로 카드 {len(cards)}장 렌더링 ({len(chunks)}묶음)")
+        try:
+            futures = {
+                self.executor.submit(_render_chunk, chunk, batch_size): i
+                for i, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"⚠️ 렌더 워커 실패 ({type(e).__name__}: {e}), 카드 {len(chunks[i])}장은 다시 렌더링합니다.")
+                    failed.append(i)
+        except Exception as e:
+            # 워커를 띄우지 못한 경우 (예: 프로세스 생성 불가)
+            print(f"⚠️ 렌더 워커를 사용할 수 없습니다: {e}")
+            failed = [i for i, result in enumerate(results) if result is None]
+
+        # 실패한 묶음만 현재 프로세스에서 다시 렌더링
+        if failed:
+            with self.generator.session() as session:
+                for i in sorted(failed):
+                    results[i] = self.generator.render_cards(chunks[i], session, batch_size)
+
+        rendered = [result for chunk_results in results for result in chunk_results]
+        ok = sum(1 for result in rendered if result['success'])
+        print(f"🧵 렌더링 완료: {ok}/{len(rendered)}장, {time.perf_counter() - start:.1f}초")
+        return rendered
@@ -0,0 +1,217 @@
+"""
+로컬 카드 렌더 서버
+렌더링 세션(Chrome 또는 Pillow)을 띄워둔 채로 카드 명세(JSON)를 받아 JPG를 돌려줌
+run_post.py / run_post_lost.py / 임시 스크립트가 RENDER_SERVER_URL로 같은 렌더러를 공유
+
+사용법:
+    python render_server.py --sessions 2 --warm chrome
+    RENDER_SERVER_URL=http://127.0.0.1:8765 python run_post.py 2026-01-13
+
+API:
+    GET  /health → {'ok': True, 'template': TEMPLATE_VERSION, 'sessions': 세션 수, 'rendered': 렌더링한 카드 수}
+    POST /render {'template', 'options': 렌더 옵션, 'batch_size', 'cards': [CardSpec.to_dict(), ...]}
+         → {'results': [{'success': True, 'data': base64 JPG, 'complete': 사진/폰트 준비 여부} 또는 {'success': False, 'error'}, ...]}
+"""
+import argparse
+import base64
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from card_generator import CardImageGenerator, upload_options
+from card_spec import RENDERERS, TEMPLATE_VERSION, CardSpec
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = int(os.getenv('RENDER_SERVER_PORT', '8765'))
+
+
+class SessionPool:
+    """렌더 옵션(렌더러, 오프라인, 배율, 캡처 형식, 품질)별로 띄워둔 렌더링 세션 묶음 (세션 하나는 한 요청만 사용)"""
+
+    def __init__(self, size: int = 1):
+        self.size = max(1, size)
+        self._generators: Dict[Tuple, CardImageGenerator] = {}
+        self._sessions: Dict[Tuple, queue.Queue] = {}
+        self._all_sessions = []
+        self._warmed: List[Tuple] = []
+        self._lock = threading.Lock()
+        self.rendered = 0
+
+    def get(self, options: Dict, warming: bool = False) -> Tuple[CardImageGenerator, queue.Queue]:
+        """
+        옵션에 맞는 생성기와 세션 큐 (처음이면 생성, 잘못된 옵션은 ValueError)
+
+        미리 띄운 세션이 있는데 요청 옵션이 그와 다르면 새 세션을 띄우면서 경고합니다
+        (--warm 옵션과 클라이언트 옵션이 어긋나 미리 띄운 브라우저가 놀고 있다는 뜻).
+        """
+        key = tuple(sorted(options.items()))
+        with self._lock:
+            if key not in self._generators:
+                if self._warmed and not warming:
+                    warmed = ', '.join(str(dict(warmed_key)) for warmed_key in self._warmed)
+                    print(f"⚠️ 미리 띄운 세션과 다른 렌더 옵션이라 세션을 새로 띄웁니다: {options} (미리 띄운 옵션: {warmed})")
+                generator = CardImageGenerator(**options)
+                sessions = queue.Queue()
+                for _ in range(self.size):
+                    session = generator.session()
+                    sessions.put(session)
+                    self._all_sessions.append(session)
+                self._generators[key] = generator
+                self._sessions[key] = sessions
+            if warming and key not in self._warmed:
+                self._warmed.append(key)
+            return self._generators[key], self._sessions[key]
+
+    def warm(self, options: Dict):
+        """브라우저를 미리 띄워 첫 요청도 바로 렌더링"""
+        generator, sessions = self.get(options, warming=True)
+        for session in list(sessions.queue):
+            # RenderSession은 driver에 처음 접근할 때 Chrome을 시작 (Pillow는 준비할 것 없음)
+            getattr(session, 'driver', None)
+        print(f"🔥 {generator.renderer} 세션 {self.size}개 준비 완료 ({generator.render_options()})")
+
+    def render(
+        self,
+        cards: List[CardSpec],
+        generator: CardImageGenerator,
+        sessions: queue.Queue,
+        batch_size: Optional[int] = None
+    ) -> List[Dict]:
+        """get()으로 받은 세션 큐에서 쉬는 세션 하나를 빌려 렌더링"""
+        session = sessions.get()
+        try:
+            results = generator.render_cards(cards, session, batch_size)
+        finally:
+            sessions.put(session)
+        with self._lock:
+            self.rendered += sum(1 for result in results if result['success'])
+        return results
+
+    def close(self):
+        with self._lock:
+            for session in self._all_sessions:
+                try:
+                    session.close()
+                except Exception as e:
+                    print(f"⚠️ 세션 종료 실패: {e}")
+            self._all_sessions = []
+            self._generators = {}
+            self._sessions = {}
+            self._warmed = []
+
+
+class RenderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], pool: SessionPool):
+        super().__init__(address, RenderHandler)
+        self.pool = pool
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'FindYouRender/1'
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'not found'})
+            return
+        pool = self.server.pool
+        self._send_json(200, {
+            'ok': True,
+            'template': TEMPLATE_VERSION,
+            'sessions': pool.size,
+            'rendered': pool.rendered,
+        })
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length))
+            cards = [CardSpec.from_dict(card) for card in request['cards']]
+            options = dict(request.get('options') or {})
+            batch_size = request.get('batch_size')
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f"잘못된 요청: {e}"})
+            return
+
+        # 서버를 띄운 뒤 카드 디자인이 바뀌었으면 클라이언트가 직접 렌더링하도록 거절
+        if request.get('template') != TEMPLATE_VERSION:
+            self._send_json(409, {'error': f"템플릿 버전 불일치 (서버 {TEMPLATE_VERSION})"})
+            return
+        try:
+            generator, sessions = self.server.pool.get(options)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': f"잘못된 렌더 옵션: {e}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            results = self.server.pool.render(cards, generator, sessions, batch_size)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        print(f"📦 카드 {len(cards)}장 렌더링 ({generator.renderer}, {time.perf_counter() - start:.1f}초)")
+        self._send_json(200, {'results': [
+            {
+                'success': True,
+                'data': base64.b64encode(result['data']).decode('ascii'),
+                'complete': result.get('complete', True),
+            } if result['success'] else result
+            for result in results
+        ]})
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 카드 렌더 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'바인드 주소 (기본: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본: RENDER_SERVER_PORT 또는 {DEFAULT_PORT})')
+    parser.add_argument('--sessions', type=int, default=1, help='렌더러별로 띄워둘 세션 수 (기본: 1)')
+    parser.add_argument('--warm', choices=RENDERERS, action='append', default=[], help='시작할 때 미리 띄울 렌더러 (포스팅 스크립트와 같은 upload_options 렌더 옵션)')
+    parser.add_argument('--offline', action='store_true', default=None, help='미리 띄울 세션을 오프라인 모드로 준비')
+    args = parser.parse_args()
+
+    pool = SessionPool(args.sessions)
+    for renderer in args.warm:
+        # 포스팅 스크립트와 같은 upload_options로 만든 렌더 옵션 (배율/품질이 요청과 같아야 세션 재사용)
+        pool.warm(CardImageGenerator(server=None, **upload_options(renderer, args.offline)).render_options())
+
+    server = RenderServer((args.host, args.port), pool)
+
+    def stop(*_):
+        # serve_forever와 다른 스레드에서 종료 요청
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"🖥️ 렌더 서버 시작: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        print(f"👋 렌더 서버 종료 (카드 {pool.rendered}장 렌더링)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+헤드리스 Chrome 렌더링 세션
+브라우저를 한 번만 띄워두고 여러 카드 HTML을 차례로 불러와 스크린샷
+"""
+import base64
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+
+# 폰트 + 모든 <img>의 load/error 이벤트를 기다린 뒤, 한 프레임 그려지면 완료
+# 반환값: {ready: 제한 시간 안에 준비됐는지, waited_ms: 실제 대기 시간}
+READY_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const timeoutMs = arguments[0];
+const start = performance.now();
+let finished = false;
+let failed = Array.from(document.images).filter((img) => img.complete && !img.naturalWidth).length;
+const finish = (ready) => {
+    if (finished) return;
+    finished = true;
+    requestAnimationFrame(() => requestAnimationFrame(() =>
+        done({ready: ready, failed_images: failed, waited_ms: performance.now() - start})));
+};
+const images = Array.from(document.images).map((img) =>
+    img.complete ? Promise.resolve() : new Promise((resolve) => {
+        img.addEventListener('load', resolve, {once: true});
+        img.addEventListener('error', () => { failed += 1; resolve(); }, {once: true});
+    })
+);
+const fonts = (document.fonts && document.fonts.ready) ? document.fonts.ready : Promise.resolve();
+Promise.all([fonts, ...images]).then(() => finish(true), () => finish(true));
+setTimeout(() => finish(false), timeoutMs);
+"""
+
+
+class RenderSession:
+    # ChromeDriverManager().install() 결과 (프로세스당 한 번만 확인)
+    _driver_path = None
+
+    def __init__(
+        self,
+        width: int = 1080,
+        height: int = 1500,
+        scale: int = 2,
+        ready_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            width: 캔버스 너비 (CSS px)
+            height: 캔버스 높이 (CSS px)
+            scale: device scale factor (2면 2160x3000 캡처)
+            ready_timeout: 폰트/이미지 로딩을 기다릴 최대 시간 (초, 기본: RENDER_READY_TIMEOUT 또는 10)
+        """
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.ready_timeout = ready_timeout if ready_timeout is not None else float(os.getenv('RENDER_READY_TIMEOUT', '10'))
+        self._driver = None
+        self._asset_dir = None
+        self.rendered = 0
+        # 카드별 실제 대기 시간 (초) 및 제한 시간 초과 횟수
+        self.wait_times = []
+        self.timeouts = 0
+        self.image_errors = 0
+        # 마지막 페이지가 폰트/사진까지 모두 준비된 상태로 캡처됐는지 (아니면 렌더 캐시에 넣지 않음)
+        self.last_ready = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @classmethod
+    def _service(cls):
+        """webdriver-manager가 있으면 드라이버 경로를 한 번만 받아 재사용"""
+        if cls._driver_path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                cls._driver_path = ChromeDriverManager().install()
+            except Exception:
+                cls._driver_path = ''
+        return Service(cls._driver_path) if cls._driver_path else None
+
+    def _start(self):
+        """Chrome WebDriver 설정"""
+        print("🌐 WebDriver 시작 중...")
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--hide-scrollbars')
+        chrome_options.add_argument('--disable-web-security')
+        chrome_options.add_argument('--allow-file-access-from-files')
+        chrome_options.add_argument(f'--window-size={self.width},{self.height}')
+        chrome_options.add_argument(f'--force-device-scale-factor={self.scale}')
+
+        service = self._service()
+        try:
+            if service:
+                driver = webdriver.Chrome(service=service, options=chrome_options)
+            else:
+                driver = webdriver.Chrome(options=chrome_options)
+        except Exception:
+            if not service:
+                raise
+            driver = webdriver.Chrome(options=chrome_options)
+
+        driver.set_window_size(self.width, self.height)
+        driver.set_script_timeout(self.ready_timeout + 5)
+        return driver
+
+    @property
+    def driver(self):
+        """처음 사용할 때 브라우저 시작"""
+        if self._driver is None:
+            self._driver = self._start()
+        return self._driver
+
+    @property
+    def asset_dir(self) -> str:
+        """이 세션 전용 임시 폴더 (페이지 HTML과 카드 사진 파일, close()에서 삭제)"""
+        if self._asset_dir is None:
+            self._asset_dir = tempfile.mkdtemp(prefix='card_render_')
+        return self._asset_dir
+
+    def load(self, html: str):
+        """
+        HTML을 임시 파일로 써서 file://로 불러와 현재 페이지 내용을 교체
+
+        data: URL로 보내면 (폰트/사진까지 base64로 한 번 더 인코딩돼) 매번 수 MB를 WebDriver로 보내고
+        Chrome URL 길이 제한(2MB)에 걸릴 수 있습니다. file:// 페이지는 폰트/사진 파일도 바로 읽습니다.
+        """
+        path = os.path.join(self.asset_dir, 'page.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+        # 이전 페이지에서만 쓰던 사진 파일 정리 (렌더 서버처럼 오래 쓰는 세션에서 쌓이지 않게)
+        for name in os.listdir(self.asset_dir):
+            if name != 'page.html' and name not in html:
+                os.remove(os.path.join(self.asset_dir, name))
+        self.driver.get(Path(path).as_uri())
+
+    def wait_until_ready(self) -> float:
+        """
+        폰트(document.fonts.ready)와 동물 사진(<img> load/error)이 준비될 때까지 대기
+
+        고정 sleep 대신 이벤트로 판단하므로 준비되면 바로 진행하고,
+        느린 이미지 서버는 ready_timeout까지 기다립니다.
+
+        Returns:
+            실제 대기 시간 (초)
+        """
+        start = time.perf_counter()
+        result = self.driver.execute_async_script(READY_SCRIPT, int(self.ready_timeout * 1000)) or {}
+        waited = time.perf_counter() - start
+
+        self.wait_times.append(waited)
+        ready = result.get('ready', True)
+        failed_images = result.get('failed_images', 0)
+        if not ready:
+            self.timeouts += 1
+            print(f"⚠️ {self.ready_timeout:.0f}초 안에 폰트/이미지가 준비되지 않아 그대로 캡처합니다.")
+        if failed_images:
+            self.image_errors += failed_images
+            print(f"⚠️ 사진 {failed_images}장을 불러오지 못해 사진 없이 캡처합니다.")
+        self.last_ready = ready and not failed_images
+        return waited
+
+    def print_wait_summary(self):
+        if not self.wait_times:
+            return
+        waits = sorted(self.wait_times)
+        print(f"⏱️ 렌더 준비 대기: {len(waits)}장, 평균 {sum(waits) / len(waits) * 1000:.0f}ms, "
+              f"최대 {waits[-1] * 1000:.0f}ms, 시간 초과 {self.timeouts}장, 사진 실패 {self.image_errors}장")
+
+    def fit_canvas(self, height: Optional[int] = None):
+        """스크롤바를 숨기고 body를 캔버스 크기에 맞춤 (height: 여러 카드를 이어 붙인 페이지 높이)"""
+        height = height or self.height
+        self.driver.execute_script(f"""
+            document.body.style.overflow = 'hidden';
+            document.documentElement.style.overflow = 'hidden';
+            document.body.style.margin = '0';
+            document.body.style.padding = '0';
+            document.body.style.width = '{self.width}px';
+            document.body.style.height = '{height}px';
+        """)
+
+    def screenshot_png(self) -> bytes:
+        """현재 화면을 PNG bytes로 캡처 (디스크에 쓰지 않음)"""
+        png = self.driver.get_screenshot_as_png()
+        self.rendered += 1
+        return png
+
+    def capture_clip(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        format: str = 'png',
+        quality: Optional[int] = None
+    ) -> bytes:
+        """
+        페이지의 한 영역만 캡처 (CDP Page.captureScreenshot + clip)
+
+        captureBeyondViewport로 창 밖(아래로 이어 붙인 카드)도 스크롤 없이 캡처합니다.
+        결과 해상도는 영역 크기 x device scale factor입니다.
+        format='jpeg'이면 Chrome이 quality(0~100)로 바로 JPG 인코딩한 bytes를 반환합니다.
+        """
+        params = {
+            'format': format,
+            'clip': {'x': x, 'y': y, 'width': width, 'height': height, 'scale': 1},
+            'captureBeyondViewport': True,
+            'fromSurface': True,
+        }
+        if format == 'jpeg' and quality is not None:
+            params['quality'] = quality
+        result = self.driver.execute_cdp_cmd('Page.captureScreenshot', params)
+        self.rendered += 1
+        return base64.b64decode(result['data'])
+
+    def close(self):
+        try:
+            if self._driver is not None:
+                try:
+                    self._driver.quit()
+                finally:
+                    self._driver = None
+        finally:
+            if self._asset_dir is not None:
+                shutil.rmtree(self._asset_dir, ignore_errors=True)
+                self._asset_dir = None
@@ -6,31 +6,52 @@ Instagram 자동 포스팅 전체 시퀀스
 4. Instagram 캐러셀 포스팅 (지정 날짜)
 """
 import os
-import json
-import time
 import random
-import requests
 from dotenv import load_dotenv
 from datetime import datetime
 from create_image import ImageGenerator
-from fetch_animals import AnimalDataFetcher
+from instagram_poster import InstagramPoster
+from cdn_uploader import CDN_MANIFEST_DIR, CDN_MANIFEST_TTL, CdnUploader
+from disk_cache import DiskCache
+from card_generator import RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_TTL, upload_options
+from photo_cache import PhotoCache
+from animal_record import Species, parse_abandoned
+from fetch_animals import AnimalDataFetcher, reservoir_sample, DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
 
 load_dotenv()
 
 
 class InstagramAutoPost:
-    def __init__(self):
+    def __init__(self, renderer=None, offline=None, workers=None):
         # FindYou CDN 설정
-        self.cdn_url = os.getenv("FINDYOU_CDN_URL")
-        self.cdn_token = os.getenv("FINDYOU_CDN_TOKEN")
+        # (keep-alive 커넥션, 여러 장을 한 요청으로 묶어 동시 업로드, URL은 카드 순서대로)
+        # (이미 올린 이미지는 내용 해시로 찾아 기존 URL 재사용)
+        self.uploader = CdnUploader(
+            os.getenv("FINDYOU_CDN_URL"), os.getenv("FINDYOU_CDN_TOKEN"),
+            manifest=DiskCache(CDN_MANIFEST_DIR, ttl=CDN_MANIFEST_TTL)
+        )
 
         # Instagram 설정
         self.ig_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.ig_account_id = os.getenv("INSTAGRAM_ACCOUNT_ID")
-        self.graph_api = "https://graph.facebook.com/v20.0"
+        # (캐러셀 아이템은 동시에 생성하고 함께 준비 대기, 순서는 URL 순서 유지)
+        self.poster = InstagramPoster(self.ig_token, self.ig_account_id)
 
-        # 이미지 생성기
-        self.image_generator = ImageGenerator()
+        # 이미지 생성기 (renderer: chrome / pillow, 기본: CARD_RENDERER 또는 chrome)
+        # offline: 폰트 CDN 없이 로컬 폰트 번들만 사용
+        # photos: 선택된 동물 사진을 미리 받아 줄인 뒤 카드에 직접 넣음 (디스크 LRU 캐시)
+        # cache: 같은 카드(날짜/문구/사진)는 다시 렌더링하지 않음 (재실행, 미리보기 후 --post)
+        # encoder: 업로드 품질로 바로 캡처하고, 1080px/용량 예산을 넘을 때만 다시 인코딩
+        # (업로드 너비 1080px에 맞춰 배율 1로 그려 크게 그렸다 줄이지 않음)
+        options = upload_options(renderer, offline)
+        self.photos = PhotoCache(scale=options['scale'])
+        self.image_generator = ImageGenerator(
+            photos=self.photos,
+            cache=DiskCache(RENDER_CACHE_DIR, ttl=RENDER_CACHE_TTL, max_bytes=RENDER_CACHE_MAX_BYTES),
+            **options
+        )
+        # 렌더 워커 프로세스 수 (기본: RENDER_WORKERS 또는 1)
+        self.workers = workers
 
         # API 키
         self.api_key = os.getenv('ANIMAL_API_KEY')
@@ -41,80 +62,69 @@ class InstagramAutoPost:
         print(f"1️⃣ 동물 데이터 가져오기 ({target_date.strftime('%Y-%m-%d')})")
         print("=" * 60)
         
-        fetcher = AnimalDataFetcher(self.api_key)
+        fetcher = AnimalDataFetcher(self.api_key, cache=DiskCache(DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL))
         date_str = target_date.strftime('%Y%m%d')
         
-        def parse_animals(data):
-            """API 응답에서 동물 리스트 추출 및 이미지 필터링"""
-            if not data or 'response' not in data:
-                return []
-            response = data['response']
-            if 'body' not in response or 'items' not in response['body']:
-                return []
-            items = response['body']['items']
-            if isinstance(items, dict) and 'item' in items:
-                animals = items['item']
-            else:
-                animals = items
-            if isinstance(animals, dict):
-                animals = [animals]
-            # 이미지 필터링
-            result = []
-            for animal in animals:
-                popfile1 = animal.get('popfile1', '')
-                if popfile1 and popfile1.startswith('http') and '/shelter/' in popfile1 and len(popfile1) > 80:
-                    result.append(animal)
-            return result
+        def has_valid_image(animal):
+            """이미지 URL이 유효한 동물만 통과"""
+            popfile1 = animal.popfile1
+            return bool(popfile1 and popfile1.startswith('http') and '/shelter/' in popfile1 and len(popfile1) > 80)
+        
+        def sample_region(upr_cd, stream):
+            """해당 날짜 전체 페이지를 스트리밍하며 이미지 있는 동물 중 균등 추출"""
+            k = region_quota[upr_cd]
+            seen = [0]
+            
+            def candidates():
+                for animal in map(parse_abandoned, stream):
+                    if has_valid_image(animal):
+                        seen[0] += 1
+                        yield animal
+            
+            picks = reservoir_sample(candidates(), k)
+            region_counts[upr_cd] = seen[0]
+            return picks
+        
+        # 서울(6110000) 1 + 경기(6410000) 1 + 전국(None) 나머지를 동시에 조회
+        # 전국 표본은 서울/경기 선택분과 겹칠 수 있으므로 count만큼 넉넉히 뽑아둔다
+        region_quota = {"6110000": 1, "6410000": 1, None: count}
+        region_labels = {"6110000": "서울", "6410000": "경기", None: "전체"}
+        region_counts = {}
+        
+        print("\n📍 서울 / 경기 / 전체 데이터 동시 조회 중...")
+        picks_by_region = fetcher.fetch_regions(
+            region_quota.keys(),
+            max_workers=len(region_quota),
+            page_concurrency=4,
+            collect=sample_region,
+            bgnde=date_str,
+            endde=date_str
+        )
+        for upr_cd, label in region_labels.items():
+            print(f"   - {label}: {region_counts.get(upr_cd, 0)}마리 (이미지 있는 것)")
         
         selected = []
         selected_ids = set()  # desertionNo로 중복 체크
         
-        # 1. 서울(6110000)에서 1마리
-        print("\n📍 서울 데이터 조회 중...")
-        seoul_data = fetcher.fetch_abandoned_animals(num_of_rows=100, bgnde=date_str, endde=date_str, upr_cd="6110000")
-        seoul_animals = parse_animals(seoul_data)
-        print(f"   - 서울: {len(seoul_animals)}마리 (이미지 있는 것)")
-        
-        if seoul_animals:
-            seoul_pick = random.choice(seoul_animals)
-            selected.append(seoul_pick)
-            selected_ids.add(seoul_pick.get('desertionNo'))
-            print(f"   ✅ 서울 1마리 선택: {seoul_pick.get('kindNm')} - {seoul_pick.get('careNm')}")
-        
-        # 2. 경기도(6410000)에서 1마리
-        print("\n📍 경기도 데이터 조회 중...")
-        gyeonggi_data = fetcher.fetch_abandoned_animals(num_of_rows=100, bgnde=date_str, endde=date_str, upr_cd="6410000")
-        gyeonggi_animals = parse_animals(gyeonggi_data)
-        print(f"   - 경기: {len(gyeonggi_animals)}마리 (이미지 있는 것)")
-        
-        if gyeonggi_animals:
-            # 이미 선택된 것 제외
-            available = [a for a in gyeonggi_animals if a.get('desertionNo') not in selected_ids]
-            if available:
-                gyeonggi_pick = random.choice(available)
-                selected.append(gyeonggi_pick)
-                selected_ids.add(gyeonggi_pick.get('desertionNo'))
-                print(f"   ✅ 경기 1마리 선택: {gyeonggi_pick.get('kindNm')} - {gyeonggi_pick.get('careNm')}")
-        
-        # 3. 전체에서 나머지 선택 (5마리)
+        # 1. 서울에서 1마리, 2. 경기도에서 1마리
+        for upr_cd in ("6110000", "6410000"):
+            for pick in picks_by_region.get(upr_cd, [])[:1]:
+                if pick.desertion_no in selected_ids:
+                    continue
+                selected.append(pick)
+                selected_ids.add(pick.desertion_no)
+                print(f"   ✅ {region_labels[upr_cd]} 1마리 선택: {pick.kind_nm} - {pick.care_nm}")
+        
+        # 3. 전체에서 나머지 선택 (5마리, 이미 선택된 것 제외)
         remaining_count = count - len(selected)
         if remaining_count > 0:
-            print(f"\n📍 전체 데이터 조회 중 (랜덤 {remaining_count}마리)...")
-            all_data = fetcher.fetch_abandoned_animals(num_of_rows=100, bgnde=date_str, endde=date_str)
-            all_animals = parse_animals(all_data)
-            print(f"   - 전체: {len(all_animals)}마리 (이미지 있는 것)")
-            
-            # 이미 선택된 것 제외
-            available = [a for a in all_animals if a.get('desertionNo') not in selected_ids]
-            
-            if len(available) >= remaining_count:
-                random_picks = random.sample(available, remaining_count)
-            else:
-                random_picks = available
+            available = [a for a in picks_by_region.get(None, []) if a.desertion_no not in selected_ids]
+            random.shuffle(available)
+            random_picks = available[:remaining_count]
             
             for pick in random_picks:
                 selected.append(pick)
-                selected_ids.add(pick.get('desertionNo'))
+                selected_ids.add(pick.desertion_no)
             
             print(f"   ✅ 랜덤 {len(random_picks)}마리 선택")
         
@@ -122,60 +132,57 @@ class InstagramAutoPost:
         
         print(f"✅ {len(animals)}마리 데이터 가져오기 완료")
         for i, animal in enumerate(animals):
-            print(f"   {i+1}. {animal.get('kindNm', 'N/A')} - {animal.get('careNm', 'N/A')}")
+            print(f"   {i+1}. {animal.kind_nm or 'N/A'} - {animal.care_nm or 'N/A'}")
+        
+        fetcher.http.stats.print_summary()
         
         return animals
     
-    def generate_images(self, animals, target_date):
-        """2. 이미지 생성 (지정 날짜)"""
+    def generate_images(self, animals, target_date, save=False):
+        """
+        2. 이미지 생성 (지정 날짜)
+
+        Args:
+            save: True면 generated_images/에 JPG 파일도 저장 (기본은 메모리에만 보관)
+
+        Returns:
+            [{'name': 파일명, 'data': JPG bytes, 'path': 저장 경로 또는 None}, ...]
+        """
         print("\n" + "=" * 60)
         print(f"2️⃣ 이미지 생성 ({target_date.strftime('%Y-%m-%d')})")
         print("=" * 60)
         
-        image_paths = []
+        images = []
+        output_dir = "generated_images" if save else None
         
-        for i, animal in enumerate(animals):
-            print(f"\n[{i+1}/{len(animals)}] {animal.get('kindNm', 'N/A')} 이미지 생성 중...")
-            result = self.image_generator.create_image(animal, target_date=target_date)
-            
+        # 사진을 동시에 미리 받아 두면 렌더링이 보호소 서버 응답을 기다리지 않음
+        self.photos.prefetch(animal.popfile1 for animal in animals)
+        
+        # 브라우저는 한 번만 띄우고, 여러 카드를 한 페이지에 모아 렌더링
+        with self.image_generator.session() as session:
+            results = self.image_generator.create_images(
+                animals, output_dir, target_date=target_date, session=session, workers=self.workers
+            )
+            session.print_wait_summary()
+        self.image_generator.encoder.print_summary()
+        
+        for i, (animal, result) in enumerate(zip(animals, results)):
             if result['success']:
-                image_paths.append(result['path'])
-                print(f"   ✅ {result['path']}")
+                images.append(result)
+                print(f"   ✅ [{i+1}/{len(animals)}] {animal.kind_nm or 'N/A'}: {result['path'] or result['name']}")
             else:
-                print(f"   ❌ 실패: {result.get('error')}")
+                print(f"   ❌ [{i+1}/{len(animals)}] {animal.kind_nm or 'N/A'} 실패: {result.get('error')}")
         
-        print(f"\n✅ 총 {len(image_paths)}개 이미지 생성 완료")
-        return image_paths
+        print(f"\n✅ 총 {len(images)}개 이미지 생성 완료")
+        return images
     
-    def upload_to_cdn(self, image_paths):
-        """3. CDN에 이미지 업로드"""
+    def upload_to_cdn(self, images):
+        """3. CDN 업로드 (메모리의 JPG bytes를 동시에 전송, 실패한 이미지는 제외하고 순서 유지)"""
         print("\n" + "=" * 60)
         print("3️⃣ CDN 업로드")
         print("=" * 60)
         
-        if not self.cdn_token:
-            raise Exception("FINDYOU_CDN_TOKEN 환경변수가 필요합니다.")
-        
-        urls = []
-        headers = {"Authorization": f"Bearer {self.cdn_token}"}
-        
-        for i, path in enumerate(image_paths):
-            print(f"\n[{i+1}/{len(image_paths)}] 업로드 중: {os.path.basename(path)}")
-            
-            with open(path, 'rb') as f:
-                files = {'files': (os.path.basename(path), f, 'image/jpeg')}
-                response = requests.post(self.cdn_url, headers=headers, files=files)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data', {}).get('urls'):
-                    url = data['data']['urls'][0]
-                    urls.append(url)
-                    print(f"   ✅ {url}")
-                else:
-                    print(f"   ❌ 업로드 실패: {data}")
-            else:
-                print(f"   ❌ HTTP 오류: {response.status_code}")
+        urls = [url for url in self.uploader.upload(images) if url]
         
         print(f"\n✅ 총 {len(urls)}개 URL 생성 완료")
         return urls
@@ -186,7 +193,7 @@ class InstagramAutoPost:
         
         for animal in animals:
             # 지역
-            org_nm = animal.get('orgNm', '')
+            org_nm = animal.org_nm
             if '충청북' in org_nm or '충북' in org_nm:
                 tags.add('#충북')
             if '보은' in org_nm:
@@ -215,28 +222,27 @@ class InstagramAutoPost:
                 tags.add('#제주')
             
             # 동물 종류
-            up_kind = animal.get('upKindNm', '')
-            if up_kind == '개':
+            if animal.species == Species.DOG:
                 tags.add('#강아지')
                 tags.add('#유기견')
-            elif up_kind == '고양이':
+            elif animal.species == Species.CAT:
                 tags.add('#고양이')
                 tags.add('#유기묘')
             
             # 품종 (띄어쓰기 제거, 2글자 이상만)
-            kind_nm = animal.get('kindNm', '').replace(' ', '')
+            kind_nm = animal.kind_nm.replace(' ', '')
             if kind_nm and len(kind_nm) >= 2 and kind_nm not in ['기타']:
                 tags.add(f'#{kind_nm}')
             
             # 색상 (2글자 이상만)
-            color = animal.get('colorCd', '')
+            color = animal.color
             clean_colors = ['흰색', '검정', '갈색', '황색', '회색', '황갈색', '크림', '흑색', '백색']
             for c in clean_colors:
                 if c in color:
                     tags.add(f'#{c}')
             
             # 보호센터 (띄어쓰기 제거)
-            care_nm = animal.get('careNm', '').replace(' ', '')
+            care_nm = animal.care_nm.replace(' ', '')
             if care_nm and len(care_nm) >= 2:
                 tags.add(f'#{care_nm}')
         
@@ -276,69 +282,14 @@ class InstagramAutoPost:
         caption = self.generate_caption(animals, target_date)
         print(f"\n📝 캡션:\n{caption}\n")
         
-        # 캐러셀 아이템 생성
-        print("캐러셀 아이템 생성 중...")
-        item_ids = []
-        
-        for i, url in enumerate(urls):
-            print(f"   [{i+1}/{len(urls)}] 아이템 생성...")
-            response = requests.post(
-                f"{self.graph_api}/{self.ig_account_id}/media",
-                data={
-                    "image_url": url,
-                    "is_carousel_item": "true",
-                    "access_token": self.ig_token
-                }
-            )
-            
-            if response.status_code == 200:
-                item_id = response.json().get('id')
-                item_ids.append(item_id)
-                print(f"      ✅ ID: {item_id}")
-            else:
-                print(f"      ❌ 실패: {response.json()}")
-        
-        if len(item_ids) < 2:
-            raise Exception("캐러셀에는 최소 2개 이미지가 필요합니다.")
-        
-        # 캐러셀 컨테이너 생성
-        print("\n캐러셀 컨테이너 생성 중...")
-        response = requests.post(
-            f"{self.graph_api}/{self.ig_account_id}/media",
-            data={
-                "media_type": "CAROUSEL",
-                "children": ",".join(item_ids),
-                "caption": caption,
-                "access_token": self.ig_token
-            }
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"캐러셀 생성 실패: {response.json()}")
-        
-        carousel_id = response.json().get('id')
-        print(f"   ✅ 캐러셀 ID: {carousel_id}")
+        # 캐러셀 아이템 동시 생성 → 캐러셀 생성 → 게시
+        result = self.poster.post_carousel(urls, caption)
+        self.poster.print_summary()
+        if not result['success']:
+            raise Exception(f"{result['message']} {result.get('error', '')}".strip())
         
-        # 잠시 대기
-        print("\n처리 대기 중...")
-        time.sleep(3)
-        
-        # 게시
-        print("게시 중...")
-        response = requests.post(
-            f"{self.graph_api}/{self.ig_account_id}/media_publish",
-            data={
-                "creation_id": carousel_id,
-                "access_token": self.ig_token
-            }
-        )
-        
-        if response.status_code == 200:
-            media_id = response.json().get('id')
-            print(f"\n🎉 포스팅 성공! 미디어 ID: {media_id}")
-            return {"success": True, "media_id": media_id}
-        else:
-            raise Exception(f"게시 실패: {response.json()}")
+        print(f"\n🎉 포스팅 성공! 미디어 ID: {result['media_id']}")
+        return {"success": True, "media_id": result['media_id']}
     
     def run(self, target_date, count=7, post=False):
         """
@@ -361,14 +312,14 @@ class InstagramAutoPost:
             # 1. 동물 데이터 가져오기
             animals = self.fetch_animals(target_date, count)
             
-            # 2. 이미지 생성
-            image_paths = self.generate_images(animals, target_date)
+            # 2. 이미지 생성 (포스팅하지 않을 때만 확인용 파일 저장)
+            images = self.generate_images(animals, target_date, save=not post)
             
-            if not image_paths:
+            if not images:
                 raise Exception("생성된 이미지가 없습니다.")
             
             # 3. CDN 업로드
-            urls = self.upload_to_cdn(image_paths)
+            urls = self.upload_to_cdn(images)
             
             if not urls:
                 raise Exception("업로드된 이미지가 없습니다.")
@@ -376,17 +327,6 @@ class InstagramAutoPost:
             # 4. Instagram 포스팅 (post=True일 때만)
             if post:
                 result = self.post_to_instagram(urls, animals, target_date)
-                
-                # 포스팅 성공 시 로컬 이미지 삭제
-                if result.get('success'):
-                    print("\n🗑️ 로컬 이미지 삭제 중...")
-                    for path in image_paths:
-                        try:
-                            if os.path.exists(path):
-                                os.remove(path)
-                                print(f"   ✅ 삭제: {os.path.basename(path)}")
-                        except Exception as e:
-                            print(f"   ⚠️ 삭제 실패: {path} - {e}")
             else:
                 print("\n" + "=" * 60)
                 print("⏸️  포스팅 대기 (post=True로 실행하면 포스팅)")
@@ -420,13 +360,14 @@ def main():
     
     # 날짜 인자 확인
     if len(sys.argv) < 2:
-        print("❌ 사용법: python run_post.py YYYY-MM-DD [--count N] [--post]")
+        print("❌ 사용법: python run_post.py YYYY-MM-DD [--count N] [--renderer chrome|pillow] [--workers N] [--offline] [--post]")
         print("   예시: python run_post.py 2026-01-13")
         print("   예시: python run_post.py 2026-01-13 --count 5 --post")
         return
     
     target_date = sys.argv[1]
     post = "--post" in sys.argv
+    offline = True if "--offline" in sys.argv else None
     
     # --count 옵션 파싱
     count = 7  # 기본값 7 (서울 1 + 경기 1 + 랜덤 5)
@@ -437,8 +378,24 @@ def main():
         except (IndexError, ValueError):
             pass
     
+    # --renderer 옵션 파싱 (없으면 CARD_RENDERER 환경변수 또는 chrome)
+    renderer = None
+    if "--renderer" in sys.argv:
+        try:
+            renderer = sys.argv[sys.argv.index("--renderer") + 1]
+        except IndexError:
+            pass
+    
+    # --workers 옵션 파싱 (렌더 워커 프로세스 수)
+    workers = None
+    if "--workers" in sys.argv:
+        try:
+            workers = int(sys.argv[sys.argv.index("--workers") + 1])
+        except (IndexError, ValueError):
+            pass
+    
     # 실행
-    poster = InstagramAutoPost()
+    poster = InstagramAutoPost(renderer=renderer, offline=offline, workers=workers)
     result = poster.run(target_date=target_date, count=count, post=post)
     
     if result['success']:
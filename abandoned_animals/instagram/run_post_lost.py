@@ -7,63 +7,73 @@
 """
 import os
 import json
-import time
-import random
-import requests
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from urllib.parse import unquote
 from create_image_lost import LostAnimalImageGenerator
+from card_spec import RENDERERS
+from animal_record import Species, parse_lost
+from animal_store import AnimalStore
+from instagram_poster import InstagramPoster
+from cdn_uploader import CDN_MANIFEST_DIR, CDN_MANIFEST_TTL, CdnUploader
+from disk_cache import DiskCache
+from card_generator import RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES, RENDER_CACHE_TTL, upload_options
+from photo_cache import PhotoCache
+from fetch_animals import AnimalDataFetcher, DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL
+from image_probe import ImageProber
+from posted_ledger import PostedLedger
 
 load_dotenv()
 
+# 이미지 접근 확인 결과 캐시 (6시간) 및 동시 확인 수
+PROBE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache', 'probe')
+PROBE_CACHE_TTL = 6 * 60 * 60
+PROBE_MAX_WORKERS = 8
+
+# 포스팅 기록 보관 기간 (조회 기간 7일보다 넉넉하게)
+POSTED_RETENTION_DAYS = 30
+
 
 class LostAnimalAutoPost:
-    def __init__(self):
+    def __init__(self, renderer=None, offline=None, workers=None):
         # FindYou CDN 설정
-        self.cdn_url = os.getenv("FINDYOU_CDN_URL")
-        self.cdn_token = os.getenv("FINDYOU_CDN_TOKEN")
+        # (keep-alive 커넥션, 여러 장을 한 요청으로 묶어 동시 업로드, URL은 카드 순서대로)
+        # (이미 올린 이미지는 내용 해시로 찾아 기존 URL 재사용)
+        self.uploader = CdnUploader(
+            os.getenv("FINDYOU_CDN_URL"), os.getenv("FINDYOU_CDN_TOKEN"),
+            manifest=DiskCache(CDN_MANIFEST_DIR, ttl=CDN_MANIFEST_TTL)
+        )
 
         # Instagram 설정
         self.ig_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.ig_account_id = os.getenv("INSTAGRAM_ACCOUNT_ID")
-        self.graph_api = "https://graph.facebook.com/v20.0"
+        # (캐러셀 아이템은 동시에 생성하고 함께 준비 대기, 순서는 URL 순서 유지)
+        self.poster = InstagramPoster(self.ig_token, self.ig_account_id)
 
-        # 이미지 생성기
-        self.image_generator = LostAnimalImageGenerator()
+        # 이미지 생성기 (renderer: chrome / pillow, 기본: CARD_RENDERER 또는 chrome)
+        # offline: 폰트 CDN 없이 로컬 폰트 번들만 사용
+        # photos: 선택된 동물 사진을 미리 받아 줄인 뒤 카드에 직접 넣음 (디스크 LRU 캐시)
+        # cache: 같은 카드(날짜/문구/사진)는 다시 렌더링하지 않음 (재실행, 미리보기 후 --post)
+        # encoder: 업로드 품질로 바로 캡처하고, 1080px/용량 예산을 넘을 때만 다시 인코딩
+        # (업로드 너비 1080px에 맞춰 배율 1로 그려 크게 그렸다 줄이지 않음)
+        options = upload_options(renderer, offline)
+        self.photos = PhotoCache(scale=options['scale'])
+        self.image_generator = LostAnimalImageGenerator(
+            photos=self.photos,
+            cache=DiskCache(RENDER_CACHE_DIR, ttl=RENDER_CACHE_TTL, max_bytes=RENDER_CACHE_MAX_BYTES),
+            **options
+        )
+        # 렌더 워커 프로세스 수 (기본: RENDER_WORKERS 또는 1)
+        self.workers = workers
 
         # API 키
         self.api_key = os.getenv('ANIMAL_API_KEY')
         
-        # 포스팅 기록 파일
-        self.posted_file = os.path.join(os.path.dirname(__file__), 'data', 'posted_lost_animals.json')
-        self.posted_ids = self._load_posted_ids()
-    
-    def _load_posted_ids(self):
-        """포스팅한 동물 ID 로드"""
-        if os.path.exists(self.posted_file):
-            with open(self.posted_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return set(data.get('posted_ids', []))
-        return set()
-    
-    def _save_posted_ids(self):
-        """포스팅한 동물 ID 저장"""
-        os.makedirs(os.path.dirname(self.posted_file), exist_ok=True)
-        with open(self.posted_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'posted_ids': list(self.posted_ids),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }, f, ensure_ascii=False, indent=2)
-    
-    def _get_animal_id(self, animal):
-        """동물 고유 ID 생성 (popfile URL 기반)"""
-        # popfile URL에서 파일명 추출하여 ID로 사용
-        popfile = animal.get('popfile', '')
-        if popfile and '/files/' in popfile:
-            return popfile.split('/files/')[-1]
-        # fallback: 여러 필드 조합
-        return f"{animal.get('happenDt', '')}_{animal.get('kindCd', '')}_{animal.get('happenAddr', '')}"
+        # 포스팅 기록 (append-only 원장, 기존 JSON 기록은 처음 한 번 가져옴)
+        data_dir = os.path.join(os.path.dirname(__file__), 'data')
+        self.posted = PostedLedger(
+            os.path.join(data_dir, 'posted_lost_animals.tsv'),
+            legacy_json_path=os.path.join(data_dir, 'posted_lost_animals.json')
+        )
         
     def fetch_lost_animals(self, target_date, count=5):
         """1. 실종동물 데이터 가져오기 (일주일 범위, 랜덤 선택, 중복 제외)"""
@@ -79,27 +89,13 @@ class LostAnimalAutoPost:
         endde = end_date.strftime('%Y%m%d')
         
         print(f"📅 조회 기간: {bgnde} ~ {endde} (일주일)")
-        print(f"📋 이미 포스팅한 동물: {len(self.posted_ids)}마리")
-        
-        api_url = "https://apis.data.go.kr/1543061/lossInfoService/lossInfo"
+        print(f"📋 이미 포스팅한 동물: {len(self.posted)}마리")
         
-        # API 키 디코딩 (이중 인코딩 방지)
-        decoded_key = unquote(self.api_key)
+        # API 응답 캐시 사용 (재실행 시 같은 조회는 네트워크 호출 없음)
+        fetcher = AnimalDataFetcher(self.api_key, cache=DiskCache(DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL))
         
-        params = {
-            'serviceKey': decoded_key,
-            'numOfRows': '1000',
-            'pageNo': '1',
-            '_type': 'json',
-            'bgnde': bgnde,
-            'endde': endde
-        }
-        
-        print(f"📡 API 호출: {api_url}")
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
+        print(f"📡 API 호출: {fetcher.loss_url}")
+        data = fetcher.fetch_lost_animals(num_of_rows=1000, page_no=1, bgnde=bgnde, endde=endde)
         
         if not data or 'response' not in data:
             raise Exception("실종동물 데이터를 가져올 수 없습니다.")
@@ -108,177 +104,94 @@ class LostAnimalAutoPost:
         if 'body' not in resp or 'items' not in resp['body']:
             raise Exception("응답 데이터 구조가 올바르지 않습니다.")
         
-        items = resp['body']['items']
-        if isinstance(items, dict) and 'item' in items:
-            animals = items['item']
-        else:
-            animals = items if items else []
-        
-        if isinstance(animals, dict):
-            animals = [animals]
+        animals = fetcher.extract_items(data)
         
         total_count = len(animals)
         print(f"📊 API 응답: {total_count}마리 발견")
         
-        # 필터링: 이미지 있고 + 이미 포스팅하지 않은 것만
-        filtered_animals = []
-        for animal in animals:
-            popfile = animal.get('popfile', '')
-            animal_id = self._get_animal_id(animal)
-
-            # 이미지 URL이 유효하고 + 이미 포스팅하지 않은 경우만
-            if popfile and '/files/' in popfile and animal_id not in self.posted_ids:
-                # 실제 이미지 접근 가능한지 확인
-                try:
-                    resp = requests.head(popfile, timeout=5)
-                    if resp.status_code != 200:
-                        continue
-                except Exception:
-                    continue
-                filtered_animals.append(animal)
-        
-        print(f"🔍 필터링 후 (이미지 있음 + 미포스팅): {len(filtered_animals)}마리")
-        
-        # 필드 변환 (kindCd → kindNm, happenPlace → lossPlace 등)
-        for animal in filtered_animals:
-            animal['kindNm'] = animal.get('kindCd', '')
-            animal['lossPlace'] = animal.get('happenPlace', '')
-            animal['lossDt'] = animal.get('happenDt', '')[:10].replace('-', '') if animal.get('happenDt') else ''
-            animal['_animal_id'] = self._get_animal_id(animal)  # ID 저장
-        
-        # 랜덤으로 count개 선택
-        if len(filtered_animals) > count:
-            selected = random.sample(filtered_animals, count)
-        else:
-            selected = filtered_animals[:count]
+        # 로컬 저장소에 누적 (변경분만 갱신)
+        with AnimalStore() as store:
+            counts = store.upsert_lost(animals)
+        print(f"📦 로컬 저장소: 신규 {counts['inserted']}, 변경 {counts['updated']}")
+        
+        # 필터링: 이미지 URL 있고 + 이미 포스팅하지 않은 것만
+        candidates = [
+            animal for animal in map(parse_lost, animals)
+            if animal.popfile and '/files/' in animal.popfile and animal.animal_id not in self.posted
+        ]
+        print(f"🔍 필터링 후 (이미지 URL 있음 + 미포스팅): {len(candidates)}마리")
+        
+        # 무작위 순서로 실제 이미지 접근 가능 여부를 동시에 확인하고, count개를 찾으면 중단
+        prober = ImageProber(
+            fetcher.http,
+            cache=DiskCache(PROBE_CACHE_DIR, ttl=PROBE_CACHE_TTL),
+            max_workers=PROBE_MAX_WORKERS
+        )
+        selected = prober.pick_available(candidates, count)
+        print(f"🖼️ 이미지 확인: {prober.probed}건 요청, {prober.cache_hits}건 캐시")
         
         print(f"\n🎯 선택된 동물 {len(selected)}마리:")
         for i, animal in enumerate(selected, 1):
-            happen_dt = animal.get('happenDt', '')[:10]
-            print(f"   {i}. [{happen_dt}] {animal.get('kindNm', 'N/A')} - {animal.get('lossPlace', 'N/A')}")
+            happen_dt = animal.happen_dt.strftime('%Y-%m-%d') if animal.happen_dt else ''
+            print(f"   {i}. [{happen_dt}] {animal.kind_nm or 'N/A'} - {animal.loss_place or 'N/A'}")
         
         return selected
     
-    def generate_images(self, animals, target_date):
-        """2. 이미지 생성"""
+    def generate_images(self, animals, target_date, save=False):
+        """
+        2. 이미지 생성
+
+        Args:
+            save: True면 generated_images/에 JPG 파일도 저장 (기본은 메모리에만 보관)
+
+        Returns:
+            [{'name': 파일명, 'data': JPG bytes, 'path': 저장 경로 또는 None, 'animal': 동물}, ...]
+        """
         print("\n" + "=" * 60)
         print("2️⃣ 이미지 생성")
         print("=" * 60)
         
-        image_paths = []
-        output_dir = os.path.join(os.path.dirname(__file__), 'generated_images')
+        images = []
+        output_dir = os.path.join(os.path.dirname(__file__), 'generated_images') if save else None
         
-        for i, animal in enumerate(animals, 1):
-            print(f"\n[{i}/{len(animals)}] {animal.get('kindNm', 'N/A')} 이미지 생성 중...")
-            result = self.image_generator.create_image(animal, output_dir, target_date=target_date)
-            
+        # 사진을 동시에 미리 받아 두면 렌더링이 보호소 서버 응답을 기다리지 않음
+        self.photos.prefetch(animal.popfile for animal in animals)
+        
+        # 브라우저는 한 번만 띄우고, 여러 카드를 한 페이지에 모아 렌더링
+        with self.image_generator.session() as session:
+            results = self.image_generator.create_images(
+                animals, output_dir, target_date=target_date, session=session, workers=self.workers
+            )
+            session.print_wait_summary()
+        self.image_generator.encoder.print_summary()
+        
+        for i, (animal, result) in enumerate(zip(animals, results), 1):
             if result['success']:
-                image_paths.append(result['path'])
-                print(f"   ✅ {result['path']}")
+                images.append(dict(result, animal=animal))
+                print(f"   ✅ [{i}/{len(animals)}] {animal.kind_nm or 'N/A'}: {result['path'] or result['name']}")
             else:
-                print(f"   ❌ 실패: {result.get('error', 'Unknown')}")
+                print(f"   ❌ [{i}/{len(animals)}] {animal.kind_nm or 'N/A'} 실패: {result.get('error', 'Unknown')}")
         
-        return image_paths
+        return images
     
-    def upload_to_cdn(self, image_paths):
-        """3. CDN 업로드"""
+    def upload_to_cdn(self, images):
+        """
+        3. CDN 업로드 (메모리의 JPG bytes를 동시에 전송, 실패한 이미지는 제외하고 순서 유지)
+
+        Returns:
+            업로드된 이미지 목록 (각 이미지에 'url' 추가)
+        """
         print("\n" + "=" * 60)
         print("3️⃣ CDN 업로드")
         print("=" * 60)
         
-        image_urls = []
+        uploaded = [
+            dict(image, url=url)
+            for image, url in zip(images, self.uploader.upload(images)) if url
+        ]
         
-        for i, path in enumerate(image_paths, 1):
-            print(f"\n[{i}/{len(image_paths)}] 업로드 중: {os.path.basename(path)}")
-            
-            headers = {"Authorization": f"Bearer {self.cdn_token}"}
-            
-            with open(path, 'rb') as f:
-                files = {'files': (os.path.basename(path), f, 'image/jpeg')}
-                response = requests.post(self.cdn_url, headers=headers, files=files)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success') and data.get('data', {}).get('urls'):
-                    url = data['data']['urls'][0]
-                    image_urls.append(url)
-                    print(f"   ✅ {url}")
-                else:
-                    print(f"   ❌ 업로드 실패: {data}")
-            else:
-                print(f"   ❌ HTTP {response.status_code}: {response.text}")
-        
-        return image_urls
-    
-    def create_instagram_container(self, image_url, is_carousel_item=True):
-        """Instagram 미디어 컨테이너 생성"""
-        url = f"{self.graph_api}/{self.ig_account_id}/media"
-        params = {
-            'image_url': image_url,
-            'access_token': self.ig_token,
-            'is_carousel_item': str(is_carousel_item).lower()
-        }
-        
-        response = requests.post(url, params=params)
-        data = response.json()
-        
-        if 'id' in data:
-            return {'success': True, 'container_id': data['id']}
-        return {'success': False, 'error': data}
-    
-    def create_carousel_container(self, children_ids, caption):
-        """캐러셀 컨테이너 생성"""
-        url = f"{self.graph_api}/{self.ig_account_id}/media"
-        params = {
-            'media_type': 'CAROUSEL',
-            'children': ','.join(children_ids),
-            'caption': caption,
-            'access_token': self.ig_token
-        }
-        
-        response = requests.post(url, params=params)
-        data = response.json()
-        
-        if 'id' in data:
-            return {'success': True, 'container_id': data['id']}
-        return {'success': False, 'error': data}
-    
-    def publish_media(self, container_id):
-        """미디어 게시"""
-        url = f"{self.graph_api}/{self.ig_account_id}/media_publish"
-        params = {
-            'creation_id': container_id,
-            'access_token': self.ig_token
-        }
-        
-        response = requests.post(url, params=params)
-        data = response.json()
-        
-        if 'id' in data:
-            return {'success': True, 'media_id': data['id']}
-        return {'success': False, 'error': data}
-    
-    def wait_for_container(self, container_id, max_wait=60):
-        """컨테이너 준비 대기"""
-        url = f"{self.graph_api}/{container_id}"
-        params = {
-            'fields': 'status_code',
-            'access_token': self.ig_token
-        }
-        
-        for _ in range(max_wait // 2):
-            response = requests.get(url, params=params)
-            data = response.json()
-            status = data.get('status_code', '')
-            
-            if status == 'FINISHED':
-                return True
-            elif status == 'ERROR':
-                return False
-            
-            time.sleep(2)
-        
-        return False
+        print(f"\n✅ 총 {len(uploaded)}개 URL 생성 완료")
+        return uploaded
     
     def generate_hashtags(self, animals):
         """동물 데이터 기반 해시태그 생성"""
@@ -286,7 +199,7 @@ class LostAnimalAutoPost:
         
         for animal in animals:
             # 지역
-            org_nm = animal.get('orgNm', '')
+            org_nm = animal.org_nm
             if '충청북' in org_nm or '충북' in org_nm:
                 tags.add('#충북')
             if '경기' in org_nm:
@@ -323,21 +236,20 @@ class LostAnimalAutoPost:
                 tags.add('#강원')
             
             # 동물 종류
-            up_kind = animal.get('upKindNm', '')
-            if up_kind == '개':
+            if animal.species == Species.DOG:
                 tags.add('#강아지')
                 tags.add('#실종견')
-            elif up_kind == '고양이':
+            elif animal.species == Species.CAT:
                 tags.add('#고양이')
                 tags.add('#실종묘')
             
             # 품종 (띄어쓰기 제거, 2글자 이상만)
-            kind_nm = animal.get('kindNm', '').replace(' ', '')
+            kind_nm = animal.kind_nm.replace(' ', '')
             if kind_nm and len(kind_nm) >= 2 and kind_nm not in ['기타']:
                 tags.add(f'#{kind_nm}')
             
             # 색상 (2글자 이상만)
-            color = animal.get('colorCd', '')
+            color = animal.color
             clean_colors = ['흰색', '검정', '갈색', '황색', '회색', '황갈색', '크림', '흑색', '백색']
             for c in clean_colors:
                 if c in color:
@@ -350,22 +262,6 @@ class LostAnimalAutoPost:
         
         return ' '.join(sorted(tags))
     
-    def create_single_container(self, image_url, caption):
-        """단일 이미지 컨테이너 생성"""
-        url = f"{self.graph_api}/{self.ig_account_id}/media"
-        params = {
-            'image_url': image_url,
-            'caption': caption,
-            'access_token': self.ig_token
-        }
-        
-        response = requests.post(url, params=params)
-        data = response.json()
-        
-        if 'id' in data:
-            return {'success': True, 'container_id': data['id']}
-        return {'success': False, 'error': data}
-    
     def post_to_instagram(self, image_urls, animals, target_date):
         """4. Instagram 포스팅"""
         print("\n" + "=" * 60)
@@ -391,7 +287,7 @@ class LostAnimalAutoPost:
         # 1개일 때 단일 이미지 포스팅
         if len(image_urls) == 1:
             print("📷 단일 이미지 포스팅...")
-            result = self.create_single_container(image_urls[0], caption)
+            result = self.poster.create_media_container(image_urls[0], caption)
             
             if not result['success']:
                 return result
@@ -400,61 +296,27 @@ class LostAnimalAutoPost:
             print(f"   ✅ 컨테이너 ID: {container_id}")
             
             print("\n처리 대기 중...")
-            if not self.wait_for_container(container_id):
+            status_result = self.poster.check_container_status(container_id, verbose=False)
+            if not status_result['success']:
                 return {'success': False, 'error': '컨테이너 준비 실패'}
             
             print("\n게시 중...")
-            publish_result = self.publish_media(container_id)
+            publish_result = self.poster.publish_media(container_id)
             
             if publish_result['success']:
                 print(f"   ✅ 게시 완료! 미디어 ID: {publish_result['media_id']}")
+            self.poster.print_summary()
             
             return publish_result
         
-        # 2개 이상일 때 캐러셀 포스팅
-        children_ids = []
-        for i, url in enumerate(image_urls, 1):
-            print(f"[{i}/{len(image_urls)}] 컨테이너 생성 중...")
-            result = self.create_instagram_container(url)
-            
-            if result['success']:
-                container_id = result['container_id']
-                print(f"   ✅ ID: {container_id}")
-                
-                # 컨테이너 준비 대기
-                if self.wait_for_container(container_id):
-                    children_ids.append(container_id)
-                else:
-                    print(f"   ⚠️ 컨테이너 준비 실패")
-            else:
-                print(f"   ❌ 실패: {result['error']}")
-        
-        if len(children_ids) < 2:
-            return {'success': False, 'error': '최소 2개 이미지 필요'}
-        
-        # 캐러셀 컨테이너 생성
-        print("\n캐러셀 컨테이너 생성 중...")
-        carousel_result = self.create_carousel_container(children_ids, caption)
-        
-        if not carousel_result['success']:
-            return carousel_result
+        # 2개 이상일 때 캐러셀 포스팅 (아이템 동시 생성 → 캐러셀 생성 → 게시)
+        result = self.poster.post_carousel(image_urls, caption)
         
-        carousel_id = carousel_result['container_id']
-        print(f"   ✅ 캐러셀 ID: {carousel_id}")
+        if result['success']:
+            print(f"   ✅ 게시 완료! 미디어 ID: {result['media_id']}")
+        self.poster.print_summary()
         
-        # 준비 대기
-        print("\n처리 대기 중...")
-        if not self.wait_for_container(carousel_id):
-            return {'success': False, 'error': '캐러셀 준비 실패'}
-        
-        # 게시
-        print("\n게시 중...")
-        publish_result = self.publish_media(carousel_id)
-        
-        if publish_result['success']:
-            print(f"   ✅ 게시 완료! 미디어 ID: {publish_result['media_id']}")
-        
-        return publish_result
+        return result
     
     def run(self, target_date_str, do_post=False, count=5):
         """전체 시퀀스 실행"""
@@ -471,41 +333,40 @@ class LostAnimalAutoPost:
             print("❌ 실종동물 데이터가 없습니다.")
             return False
         
-        # 2. 이미지 생성
-        image_paths = self.generate_images(animals, target_date)
+        # 2. 이미지 생성 (포스팅하지 않을 때만 확인용 파일 저장)
+        images = self.generate_images(animals, target_date, save=not do_post)
         
-        if not image_paths:
+        if not images:
             print("❌ 생성된 이미지가 없습니다.")
             return False
         
         # 3. CDN 업로드
-        image_urls = self.upload_to_cdn(image_paths)
+        uploaded = self.upload_to_cdn(images)
         
-        if not image_urls:
+        if not uploaded:
             print("❌ 업로드된 이미지가 없습니다.")
             return False
         
-        # 4. Instagram 포스팅
+        image_urls = [image['url'] for image in uploaded]
+        
+        # 4. Instagram 포스팅 (캡션/해시태그도 실제로 올라간 동물 기준)
         if do_post:
-            result = self.post_to_instagram(image_urls, animals, target_date)
+            result = self.post_to_instagram(image_urls, [image['animal'] for image in uploaded], target_date)
             if result['success']:
                 print("\n🎉 실종동물 Instagram 포스팅 완료!")
                 
-                # 포스팅 성공 시 ID 저장
-                for animal in animals:
-                    self.posted_ids.add(animal.get('_animal_id', ''))
-                self._save_posted_ids()
-                print(f"📝 포스팅 기록 저장 완료 (총 {len(self.posted_ids)}마리)")
-                
-                # 포스팅 성공 시 로컬 이미지 삭제
-                print("\n🗑️ 로컬 이미지 삭제 중...")
-                for path in image_paths:
-                    try:
-                        if os.path.exists(path):
-                            os.remove(path)
-                            print(f"   ✅ 삭제: {os.path.basename(path)}")
-                    except Exception as e:
-                        print(f"   ⚠️ 삭제 실패: {path} - {e}")
+                # 포스팅 성공 시 실제로 게시된 동물만 ID 저장 (원장 끝에 추가)
+                # (렌더링/업로드/캐러셀 아이템 생성에 실패해 빠진 동물은 다음 실행에서 다시 후보가 됨)
+                posted_urls = set(result.get('image_urls', image_urls))
+                self.posted.add(
+                    (image['animal'].animal_id, image['animal'].happen_dt.strftime('%Y%m%d') if image['animal'].happen_dt else '')
+                    for image in uploaded if image['url'] in posted_urls
+                )
+                # 조회 기간(일주일)보다 충분히 오래된 기록은 정리
+                removed = self.posted.compact(
+                    (target_date - timedelta(days=POSTED_RETENTION_DAYS)).strftime('%Y%m%d')
+                )
+                print(f"📝 포스팅 기록 저장 완료 (총 {len(self.posted)}마리, 만료 {removed}마리 정리)")
             else:
                 print(f"\n❌ 포스팅 실패: {result.get('error', 'Unknown')}")
                 return False
@@ -526,10 +387,13 @@ def main():
     parser.add_argument('date', help='날짜 (YYYY-MM-DD)')
     parser.add_argument('--post', action='store_true', help='실제로 Instagram에 포스팅')
     parser.add_argument('--count', type=int, default=5, help='포스팅할 동물 수 (기본: 5)')
+    parser.add_argument('--renderer', choices=RENDERERS, help='카드 렌더러 (기본: CARD_RENDERER 또는 chrome)')
+    parser.add_argument('--offline', action='store_true', default=None, help='로컬 폰트 번들만 사용 (기본: RENDER_OFFLINE)')
+    parser.add_argument('--workers', type=int, help='렌더 워커 프로세스 수 (기본: RENDER_WORKERS 또는 1)')
     
     args = parser.parse_args()
     
-    poster = LostAnimalAutoPost()
+    poster = LostAnimalAutoPost(renderer=args.renderer, offline=args.offline, workers=args.workers)
     poster.run(args.date, do_post=args.post, count=args.count)
 
 
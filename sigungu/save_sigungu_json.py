@@ -1,6 +1,8 @@
 import requests
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 # Service Key from environment variable
 service_key = os.getenv('PUBLIC_DATA_API_KEY')
@@ -10,6 +12,13 @@ if not service_key:
 # Base URL for the GET request
 base_url = f"http://apis.data.go.kr/1543061/abandonmentPublicSrvc/sigungu?serviceKey={service_key}"
 
+# 동시 요청 수 (기본 8)
+max_workers = int(os.getenv('SIGUNGU_MAX_WORKERS', '8'))
+
+# keep-alive 커넥션 풀을 공유하는 세션
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers))
+
 # Mapping of upr_cd to filenames
 codes_and_files = {
     "6110000": "Seoul.json",
@@ -30,15 +39,31 @@ codes_and_files = {
     "6500000": "Jeju.json"
 }
 
-# Iterate over each upr_cd and save the corresponding JSON
-for upr_cd, filename in codes_and_files.items():
+
+
+def fetch_sigungu(upr_cd):
+    """시도 코드 하나에 대한 시군구 목록 조회"""
     params = {
         "upr_cd": upr_cd,
         "_type": "json"
     }
+    return session.get(base_url, params=params, timeout=(5, 30))
 
-    # Send the GET request
-    response = requests.get(base_url, params=params)
+
+# 모든 upr_cd를 동시에 조회한 뒤 upr_cd별 응답으로 수집
+with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    futures = {upr_cd: executor.submit(fetch_sigungu, upr_cd) for upr_cd in codes_and_files}
+
+responses = {}
+for upr_cd, future in futures.items():
+    try:
+        responses[upr_cd] = future.result()
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch data for upr_cd {upr_cd}: {e}")
+
+# Iterate over each upr_cd and save the corresponding JSON
+for upr_cd, response in responses.items():
+    filename = codes_and_files[upr_cd]
 
     # Check if the request was successful
     if response.status_code == 200: